@@ -0,0 +1,47 @@
+# Benchmarking the christoffel symbol (the constructor and the getter) on the coordinates4d
+# presets. Two revisions are compared by running the benchmark on both of them, e.g.
+#
+#   git worktree add /tmp/grtcgui-old <revision>
+#   python benchmarks/christoffel.py --root /tmp/grtcgui-old
+#   python benchmarks/christoffel.py
+
+import argparse
+import time
+
+from presets import default_root, load_tree, preset_metrics, presets, reset_caches
+
+
+def benchmark_christoffel(repeat):
+    """
+    Timing the christoffel symbol of each preset, taking the best of the repeated runs
+
+    Args:
+        repeat [int]: The number of runs of each preset
+
+    Returns:
+        [dict]: The time (in seconds) of each preset
+    """
+    from objects.grtensors import ChristoffelSymbol
+    times = {}
+    for name, metric_tensor, coord_sys in preset_metrics(presets):
+        best = None
+        for _ in range(repeat):
+            reset_caches()
+            start = time.perf_counter()
+            ChristoffelSymbol(metric_tensor, coord_sys).get_christoffelsymbol()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times[name] = best
+    return times
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the christoffel symbol on the coordinates4d presets')
+    parser.add_argument('--root', default=default_root, help='the root of the benchmarked tree')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of runs of each preset')
+    args = parser.parse_args()
+    load_tree(args.root)
+    times = benchmark_christoffel(args.repeat)
+    for name, elapsed in times.items():
+        print('{0:<36}{1:8.3f}s'.format(name, elapsed))
+    print('{0:<36}{1:8.3f}s'.format('total', sum(times.values())))
@@ -0,0 +1,64 @@
+# Benchmarking each grtensor object (the constructor and the getter of its default type) on the
+# coordinates4d presets, summed over the presets. Two revisions are compared by running the
+# benchmark on both of them, e.g.
+#
+#   git worktree add /tmp/grtcgui-old <revision>
+#   python benchmarks/grtensors.py --root /tmp/grtcgui-old
+#   python benchmarks/grtensors.py
+
+import argparse
+import time
+
+from presets import default_root, load_tree, preset_metrics, reset_caches
+
+# The class and the getter of each grtensor object
+grtensor_getters = {
+    'Christoffel Symbol': ('ChristoffelSymbol', 'get_christoffelsymbol'),
+    'Riemann Tensor': ('RiemannTensor', 'get_riemanntensor'),
+    'Ricci Tensor': ('RicciTensor', 'get_riccitensor'),
+    'Ricci Scalar': ('RicciScalar', 'get_ricciscalar'),
+    'Weyl Tensor': ('WeylTensor', 'get_weyltensor'),
+    'Einstein Tensor': ('EinsteinTensor', 'get_einsteintensor'),
+    'Traceless Ricci Tensor': ('TracelessRicciTensor', 'get_trclss_riccitensor'),
+    'Kretschmann Scalar': ('KretschmannScalar', 'get_kretschmannscalar')
+}
+
+# The presets of the benchmark
+benchmark_presets = ['Spherical Coordinates', 'Rindler Coordinates', 'Schwarzschild Coordinates',
+                     'Eddington-Finkelstein Coordinates']
+
+
+def benchmark_grtensors(names, tensor_objects):
+    """
+    Timing each grtensor object from scratch (with cleared caches) on the given presets
+
+    Args:
+        names [list]: The names of the presets
+        tensor_objects [list]: The names of the grtensor objects
+
+    Returns:
+        [dict]: The time (in seconds) of each grtensor object, summed over the presets
+    """
+    import objects.grtensors as grtensors
+    times = dict.fromkeys(tensor_objects, 0)
+    for _, metric_tensor, coord_sys in preset_metrics(names):
+        for tensor_object in tensor_objects:
+            class_name, getter = grtensor_getters[tensor_object]
+            reset_caches()
+            start = time.perf_counter()
+            getattr(getattr(grtensors, class_name)(metric_tensor, coord_sys), getter)()
+            times[tensor_object] += time.perf_counter() - start
+    return times
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark each grtensor object on the coordinates4d presets')
+    parser.add_argument('--root', default=default_root, help='the root of the benchmarked tree')
+    parser.add_argument('--presets', nargs='+', default=benchmark_presets, help='the names of the presets')
+    parser.add_argument('--tensors', nargs='+', default=list(grtensor_getters), help='the names of the grtensor objects')
+    args = parser.parse_args()
+    load_tree(args.root)
+    times = benchmark_grtensors(args.presets, args.tensors)
+    for tensor_object, elapsed in times.items():
+        print('{0:<26}{1:8.2f}s'.format(tensor_object, elapsed))
+    print('{0:<26}{1:8.2f}s'.format('total', sum(times.values())))
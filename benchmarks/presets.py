@@ -0,0 +1,68 @@
+# Loading the grtcgui tree that is benchmarked and the metrics of its coordinates4d presets, so
+# that the benchmarks can be run against any revision of the repository (e.g., a git worktree)
+
+import os
+import sys
+
+from sympy import symbols, sympify
+
+# The presets of display4D/coordinates.py
+presets = ['Cartesian Coordinates', 'Cylindrical Coordinates', 'Spherical Coordinates',
+           'Conform-Compactified Coordinates', 'Rindler Coordinates', 'Schwarzschild Coordinates',
+           'Eddington-Finkelstein Coordinates']
+
+# The root of this tree, which is benchmarked unless another root is given
+default_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_tree(root=default_root):
+    """
+    Putting a given tree first on the import path. The disk cache of the tree (if it has one)
+    is turned off, so that every tensor is computed
+
+    Args:
+        root [str]: The root of the tree. Defaults to the root of this tree
+    """
+    sys.path.insert(0, os.path.join(root, 'display4D'))
+    sys.path.insert(0, root)
+    try:
+        from objects import diskcache
+        diskcache.set_disk_cache(None)
+    except ImportError:   # the revisions before the disk cache
+        pass
+
+
+def reset_caches():
+    """
+    Clearing the in-memory caches of the tree (if it has them), so that each metric is
+    benchmarked from scratch
+    """
+    try:
+        from objects.simplifyobjects import clear_expression_cache
+        clear_expression_cache()
+    except ImportError:
+        pass
+    try:
+        from objects.grtensors.spacetime import spacetimes
+        spacetimes.clear()
+    except ImportError:
+        pass
+
+
+def preset_metrics(names=presets):
+    """
+    Returns the metric tensors and the coordinate systems of given presets
+
+    Args:
+        names [list]: The names of the presets. Defaults to all of them
+
+    Returns:
+        [list]: The name, the metric tensor and the coordinate system of each preset
+    """
+    from coordinates import coordinates4d
+    metrics = []
+    for name in names:
+        metric_tensor, coord_sys = coordinates4d(name)
+        metrics.append((name, [[sympify(component) for component in row] for row in metric_tensor],
+                        list(symbols(' '.join(coord_sys)))))
+    return metrics
@@ -1,5 +1,9 @@
 import PySimpleGUI as sg
 from display4D.grtensorsGUI import grtensors_gui
+from objects.simplifyobjects import (clear_expression_cache,
+                                     clear_timed_out_components,
+                                     session_simplify_timeout,
+                                     set_simplify_timeout)
 from sympy import symbols, sympify
 
 from display3D.coordinates import coordinates3d
@@ -42,6 +46,9 @@ def grtc_gui3d(coordinate_type='Spherical Coordinates'):
     Args:
         coordinate_type (str, optional): The name of the coordinate. Defaults to 'Spherical Coordinates'
     """
+    clear_expression_cache()   # a new session does not share the cached expressions of the previous one
+    clear_timed_out_components()
+    set_simplify_timeout(session_simplify_timeout)   # a component that takes too long is given in the 'cheap' tier
     new_coordinate = coordinates3d(coordinate_type)
     new_metric_tensor = new_coordinate[0]   # the new metric choosen by the user
     new_coord_sys = new_coordinate[1]   # the new coordinate system that accompanies the metric tensor
@@ -1,5 +1,6 @@
 import PySimpleGUI as sg
 from equations.grtensorsEP import *
+from objects.simplifyobjects import get_timed_out_components
 from sympy import preview
 
 from display4D.image_resizer_grtensor import (resize_tensor_component_image,
@@ -25,6 +26,29 @@ tensor_objects2d = ['Metric Tensor', 'Ricci Tensor',
 scalar_objects = ['Ricci Scalar', 'Kretschmann Scalar']
 
 
+def show_timed_out_components(coord_sys, tensor_object, shown=()):
+    """
+    Telling the user which components of the tensor ran out of the time budget of the
+    simplification in this session, and so are given in a less simplified form
+
+    Args:
+        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+        tensor_object [str]: The name of the grtensor object (metric tensor, riemann tensor, etc.)
+        shown [tuple]: The components that are already shown
+
+    Returns:
+        [tuple]: The components that are shown so far
+    """
+    timed_out = tuple(index for _, index in get_timed_out_components(tensor_object))
+    new_components = [index for index in dict.fromkeys(timed_out) if index not in shown]
+    if new_components:
+        components = [' '.join(str(coord_sys[i]) for i in index) if isinstance(index, tuple) and index else tensor_object
+                      for index in new_components]
+        sg.popup('The simplification of these components took too long, so they are given in a less simplified form:',
+                 ', '.join(components), title='GRTC', font=('Tahoma', 11))
+    return tuple(shown) + tuple(new_components)
+
+
 def grtensors_gui(metric_tensor, coord_sys, tensor_object):
     """
     The main process of the GUI that produces the image of tensor and tensor component
@@ -37,6 +61,7 @@ def grtensors_gui(metric_tensor, coord_sys, tensor_object):
     """
     tensor_eqn = tensor_ep(metric_tensor, coord_sys, tensor_object)
     tensor_component_eqn = tensor_component_ep(metric_tensor, coord_sys, tensor_object)
+    shown = show_timed_out_components(coord_sys, tensor_object)
     preview(tensor_eqn, viewer='file', filename=r'display4D\output images\tensor.png', euler=True,
             dvioptions=['-T', 'tight', '-z', '0', '--truecolor', '-D 1200', '-bg', 'Transparent'])
     preview(tensor_component_eqn, viewer='file', filename=r'display4D\output images\tensor_component.png', euler=True,
@@ -68,6 +93,7 @@ def grtensors_gui(metric_tensor, coord_sys, tensor_object):
                 components = [values[1], values[2]]   # the components of the new tensor
                 tensor_eqn = tensor_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type)
                 tensor_component_eqn = tensor_component_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type, components)
+                shown = show_timed_out_components(coord_sys, tensor_object, shown)
                 preview(tensor_eqn, viewer='file', filename=r'display4D\output images\tensor.png', euler=True,
                         dvioptions=['-T', 'tight', '-z', '0', '--truecolor', '-D 1200', '-bg', 'Transparent'])
                 preview(tensor_component_eqn, viewer='file', filename=r'display4D\output images\tensor_component.png', euler=True,
@@ -99,6 +125,7 @@ def grtensors_gui(metric_tensor, coord_sys, tensor_object):
             if event == 'Submit':
                 components = [values[1], values[2]]
                 tensor_component_eqn = tensor_component_ep(metric_tensor, coord_sys, tensor_object, component = components)
+                shown = show_timed_out_components(coord_sys, tensor_object, shown)
                 preview(tensor_component_eqn, viewer='file', filename=r'display4D\output images\tensor_component.png', euler=True,
                         dvioptions=['-T', 'tight', '-z', '0', '--truecolor', '-D 1200', '-bg', 'Transparent'])
                 resize_tensor_component_image()
@@ -130,6 +157,7 @@ def grtensors_gui(metric_tensor, coord_sys, tensor_object):
                 components = [values[1], values[2], values[3]]
                 tensor_eqn = tensor_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type)
                 tensor_component_eqn = tensor_component_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type, components)
+                shown = show_timed_out_components(coord_sys, tensor_object, shown)
                 preview(tensor_eqn, viewer='file', filename=r'display4D\output images\tensor.png', euler=True,
                         dvioptions=['-T', 'tight', '-z', '0', '--truecolor', '-D 1200', '-bg', 'Transparent'])
                 preview(tensor_component_eqn, viewer='file', filename=r'display4D\output images\tensor_component.png', euler=True,
@@ -166,6 +194,7 @@ def grtensors_gui(metric_tensor, coord_sys, tensor_object):
                 components = [values[1], values[2], values[3], values[4]]
                 tensor_eqn = tensor_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type)
                 tensor_component_eqn = tensor_component_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type, components)
+                shown = show_timed_out_components(coord_sys, tensor_object, shown)
                 preview(tensor_eqn, viewer='file', filename=r'display4D\output images\tensor.png', euler=True,
                         dvioptions=['-T', 'tight', '-z', '0', '--truecolor', '-D 1200', '-bg', 'Transparent'])
                 preview(tensor_component_eqn, viewer='file', filename=r'display4D\output images\tensor_component.png', euler=True,
@@ -202,6 +231,7 @@ def grtensors_gui(metric_tensor, coord_sys, tensor_object):
                 components = [values[1], values[2], values[3], values[4]]
                 tensor_eqn = tensor_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type)
                 tensor_component_eqn = tensor_component_ep(metric_tensor, coord_sys, tensor_object, new_tensor_type, components)
+                shown = show_timed_out_components(coord_sys, tensor_object, shown)
                 preview(tensor_eqn, viewer='file', filename=r'display4D\output images\tensor.png', euler=True,
                         dvioptions=['-T', 'tight', '-z', '0', '--truecolor', '-D 1200', '-bg', 'Transparent'])
                 preview(tensor_component_eqn, viewer='file', filename=r'display4D\output images\tensor_component.png', euler=True,
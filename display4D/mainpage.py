@@ -4,6 +4,10 @@ from sympy import symbols, sympify
 from display4D.coordinates import coordinates4d
 from display4D.fieldsGUI import *
 from display4D.grtensorsGUI import grtensors_gui
+from objects.simplifyobjects import (clear_expression_cache,
+                                     clear_timed_out_components,
+                                     session_simplify_timeout,
+                                     set_simplify_timeout)
 
 #---------- INPUT VARIABLES ----------#
 
@@ -46,6 +50,9 @@ def grtc_gui4d(coordinate_type='Spherical Coordinates'):
     Args:
         coordinate_type (str, optional): The name of the coordinate. Defaults to 'Spherical Coordinates'
     """
+    clear_expression_cache()   # a new session does not share the cached expressions of the previous one
+    clear_timed_out_components()
+    set_simplify_timeout(session_simplify_timeout)   # a component that takes too long is given in the 'cheap' tier
     new_coordinate = coordinates4d(coordinate_type)
     new_metric_tensor = new_coordinate[0]   # the new metric choosen by the user
     new_coord_sys = new_coordinate[1]   # the new coordinate system that accompanies the metric tensor
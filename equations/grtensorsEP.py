@@ -1,12 +1,51 @@
 #---------- PRODUCING EQUATIONS OF GRTENSORS ----------#
 
+from objects.contraction import expression_size, sparse_components
 from objects.grtensors import *
+from objects.simplifyobjects import timeout_scope
 from sympy import latex
 
+# The size (the number of nodes of the expression trees) of the unsimplified components of the
+# riemann tensor, the weyl tensor or the kretschmann scalar, above which their equations are given
+# in the cse form, i.e. the table of their common subexpressions followed by the tensor in terms
+# of them (see objects.csetensor)
+cse_threshold = 10000
 
-def tensor_ep(metric_tensor, coord_sys, tensor_object, tensor_type=''):
+# The unsimplified tensor and the getter of the cse form of each grtensor object that has one
+cse_getters = {
+    'Riemann Tensor': ('riemann_obj', 'get_riemanntensor_cse'),
+    'Weyl Tensor': ('weyltensor_obj', 'get_weyltensor_cse'),
+    'Kretschmann Scalar': ('kretschmannscalar_obj', 'get_kretschmannscalar_cse')
+}
+
+
+def cse_ep(spacetime, tensor_object):
+    """
+    Producing the equation of a tensor (in its default type) in the cse form if its unsimplified
+    components are larger than cse_threshold, so that their shared subexpressions are simplified
+    only once, instead of in every component
+
+    Args:
+        spacetime [Spacetime]: The spacetime of the metric tensor
+        tensor_object [str]: The name of the grtensor object (riemann tensor, weyl tensor or kretschmann scalar)
+
+    Returns:
+        [str]: The LaTeX code of the tensor in the cse form, or None if the tensor is small
     """
-    Producing equations of tensors for a given metric and tensor type
+    xobject = spacetime.get_grtensor(tensor_object)
+    attribute, getter = cse_getters[tensor_object]
+    xtensor = getattr(xobject, attribute)
+    components = {(): xtensor} if tensor_object == 'Kretschmann Scalar' else sparse_components(xtensor)[1]
+    if expression_size(components) <= cse_threshold:
+        return None
+    with timeout_scope(tensor_object):   # the components that run out of the time budget are recorded with the object
+        return getattr(xobject, getter)().latex()
+
+
+def tensor_ep(metric_tensor, coord_sys, tensor_object, tensor_type='', strategy='full', engine='coordinate'):
+    """
+    Producing equations of tensors for a given metric and tensor type. The large riemann tensors,
+    weyl tensors and kretschmann scalars are given in the cse form (see cse_ep)
 
     Args:
         metric_tensor [list]: The metric tensor, provided by the user
@@ -14,83 +53,61 @@ def tensor_ep(metric_tensor, coord_sys, tensor_object, tensor_type=''):
         tensor_object [str]: The name of the grtensor object (metric tensor, riemann tensor, etc.)
         tensor_type [str]: The type of the tensor. Given in terms of 'u': contravariant
         and 'd': covariant
+        strategy [str]: The simplification tier of the equations. Defaults to 'full'
+        engine [str]: The algorithm of the curvature tensors; 'coordinate', 'covariant', 'cartan' or
+        'rational'. Defaults to 'coordinate'
     """
+    spacetime = get_spacetime(metric_tensor, coord_sys, strategy, engine)   # computed objects are shared between calls
+    if tensor_object in cse_getters and tensor_type == '':
+        cse_equation = cse_ep(spacetime, tensor_object)   # None for the tensors that are not large
+        if cse_equation is not None:
+            return '$$' + ('K = ' if tensor_object == 'Kretschmann Scalar' else '') + cse_equation + '$$'
+
     if tensor_object == 'Metric Tensor':
-        mt = MetricTensor(metric_tensor, coord_sys)
-        metric_tensor = mt.get_metrictensor()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(metric_tensor) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(mt.vary_metrictensor_type(metric_tensor, tensor_type)) + '$$'
+        metric_tensor = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(metric_tensor) + '$$'
 
     elif tensor_object == 'Inverse Metric Tensor':
-        mt = MetricTensor(metric_tensor, coord_sys)
-        inverse_metric_tensor = mt.get_inverse()
+        inverse_metric_tensor = spacetime.get_tensor(tensor_object)
         return '$$' + latex(inverse_metric_tensor) + '$$'
 
     elif tensor_object == 'Christoffel Symbol':
-        cs = ChristoffelSymbol(metric_tensor, coord_sys)
-        chris_symbol = cs.get_christoffelsymbol()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(chris_symbol) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(cs.vary_christoffelsymbol_type(chris_symbol, tensor_type)) + '$$'
+        chris_symbol = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(chris_symbol) + '$$'
 
     elif tensor_object == 'Riemann Tensor':
-        rt = RiemannTensor(metric_tensor, coord_sys)
-        riemann_tensor = rt.get_riemanntensor()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(riemann_tensor) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(rt.vary_riemanntensor_type(riemann_tensor, tensor_type)) + '$$'
+        riemann_tensor = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(riemann_tensor) + '$$'
 
     elif tensor_object == 'Ricci Tensor':
-        rit = RicciTensor(metric_tensor, coord_sys)
-        ricci_tensor = rit.get_riccitensor()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(ricci_tensor) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(rit.vary_riccitensor_type(ricci_tensor, tensor_type)) + '$$'
+        ricci_tensor = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(ricci_tensor) + '$$'
 
     elif tensor_object == 'Ricci Scalar':
-        rs = RicciScalar(metric_tensor, coord_sys)
-        ricci_scalar = rs.get_ricciscalar()
+        ricci_scalar = spacetime.get_tensor(tensor_object)
         return '$$R = ' + latex(ricci_scalar) + '$$'
 
     elif tensor_object == 'Traceless Ricci Tensor':
-        trt = TracelessRicciTensor(metric_tensor, coord_sys)
-        traceless_ricci_tensor = trt.get_trclss_riccitensor()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(traceless_ricci_tensor) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(trt.vary_trclss_riccitensor_type(traceless_ricci_tensor, tensor_type)) + '$$'
+        traceless_ricci_tensor = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(traceless_ricci_tensor) + '$$'
 
     elif tensor_object == 'Weyl Tensor':
-        wyl = WeylTensor(metric_tensor, coord_sys)
-        weyl_tensor = wyl.get_weyltensor()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(weyl_tensor) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(wyl.vary_weyltensor_type(weyl_tensor, tensor_type)) + '$$'
+        weyl_tensor = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(weyl_tensor) + '$$'
 
     elif tensor_object == 'Einstein Tensor':
-        et = EinsteinTensor(metric_tensor, coord_sys)
-        einstein_tensor = et.get_einsteintensor()
-        if tensor_type == '':   # default type of the given tensor
-            return '$$' + latex(einstein_tensor) + '$$'
-        else:   # changing the type of the tensor and hence the equation as well
-            return '$$' + latex(et.vary_einsteintensor_type(einstein_tensor, tensor_type)) + '$$'
+        einstein_tensor = spacetime.get_tensor(tensor_object, tensor_type)   # '' gives the default type of the given tensor
+        return '$$' + latex(einstein_tensor) + '$$'
 
     elif tensor_object == 'Kretschmann Scalar':
-        ks = KretschmannScalar(metric_tensor, coord_sys)
-        kret_scalar = ks.get_kretschmannscalar()
+        kret_scalar = spacetime.get_tensor(tensor_object)
         return '$$K = ' + latex(kret_scalar) + '$$'
 
 
 #---------- PRODUCING EQUATIONS OF TENSOR COMPONENTS ----------#
 
 
-def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='', component=''):
+def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='', component='', strategy='full', engine='coordinate'):
     """
     Producing equations of tensor components for a given metric, tensor type and component
 
@@ -101,15 +118,17 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
         tensor_type [str]: Type of the tensor. Given in terms of 'u': contravariant
         and 'd': covariant
         component [sympy.symbol]: The component of the tensor (e.g., g_{tt})
+        strategy [str]: The simplification tier of the equations. Defaults to 'full'
+        engine [str]: The algorithm of the curvature tensors; 'coordinate', 'covariant', 'cartan' or
+        'rational'. Defaults to 'coordinate'
     """
+    spacetime = get_spacetime(metric_tensor, coord_sys, strategy, engine)   # computed objects are shared between calls
     if tensor_object == 'Metric Tensor':
-        mt = MetricTensor(metric_tensor, coord_sys)
-        metric_tensor = mt.get_metrictensor()
+        metric_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$g_{{{0} {1}}} = {2}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(metric_tensor[0][0]))
         else:
-            new_metric_tensor = mt.vary_metrictensor_type(
-                metric_tensor, tensor_type)
+            new_metric_tensor = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             if tensor_type == 'dd':
@@ -120,8 +139,7 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
                 return '$$g^{{{0} {1}}} = {2}$$'.format(latex(component[0]), latex(component[1]), latex(new_metric_tensor[i, j]))
 
     elif tensor_object == 'Inverse Metric Tensor':
-        mt = MetricTensor(metric_tensor, coord_sys)
-        inverse_metric_tensor = mt.get_inverse()
+        inverse_metric_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$g^{{{0} {1}}} = {2}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(inverse_metric_tensor[0][0]))
         else:
@@ -130,13 +148,11 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
             return '$$g^{{{0} {1}}} = {2}$$'.format(latex(component[0]), latex(component[1]), latex(inverse_metric_tensor[i, j]))
 
     elif tensor_object == 'Christoffel Symbol':
-        cs = ChristoffelSymbol(metric_tensor, coord_sys)
-        chris_symbol = cs.get_christoffelsymbol()
+        chris_symbol = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$\\Gamma^{{{0}}}{{}}_{{{1} {2}}} = {3}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(coord_sys[0]), latex(chris_symbol[0][0][0]))
         else:
-            new_chris_symbol = cs.vary_christoffelsymbol_type(
-                chris_symbol, tensor_type)
+            new_chris_symbol = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             k = coord_sys.index(component[2])
@@ -150,13 +166,11 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
                 return '$$\\Gamma^{{{0} {1} {2}}} = {3}$$'.format(latex(component[0]), latex(component[1]), latex(component[2]), latex(new_chris_symbol[i, j, k]))
 
     elif tensor_object == 'Riemann Tensor':
-        rt = RiemannTensor(metric_tensor, coord_sys)
-        riemann_tensor = rt.get_riemanntensor()
+        riemann_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$R^{{{0}}}{{}}_{{{1} {2} {3}}} = {4}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(coord_sys[0]), latex(coord_sys[0]), latex(riemann_tensor[0][0][0][0]))
         else:
-            new_riemann_tensor = rt.vary_riemanntensor_type(
-                riemann_tensor, tensor_type)
+            new_riemann_tensor = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             k = coord_sys.index(component[2])
@@ -173,13 +187,11 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
                 return '$$R^{{{0} {1} {2} {3}}}= {4}$$'.format(latex(component[0]), latex(component[1]), latex(component[2]), latex(component[3]), latex(new_riemann_tensor[i, j, k, l]))
 
     elif tensor_object == 'Ricci Tensor':
-        rit = RicciTensor(metric_tensor, coord_sys)
-        ricci_tensor = rit.get_riccitensor()
+        ricci_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$R_{{{0} {1}}} = {2}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(ricci_tensor[0][0]))
         else:
-            new_ricci_tensor = rit.vary_riccitensor_type(
-                ricci_tensor, tensor_type)
+            new_ricci_tensor = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             if tensor_type == 'dd':
@@ -190,13 +202,11 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
                 return '$$R^{{{0} {1}}} = {2}$$'.format(latex(component[0]), latex(component[1]), latex(new_ricci_tensor[i, j]))
 
     elif tensor_object == 'Traceless Ricci Tensor':
-        trt = TracelessRicciTensor(metric_tensor, coord_sys)
-        traceless_ricci_tensor = trt.get_trclss_riccitensor()
+        traceless_ricci_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$Z_{{{0} {1}}} = {2}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(traceless_ricci_tensor[0][0]))
         else:
-            new_traceless_ricci_tensor = trt.vary_trclss_riccitensor_type(
-                traceless_ricci_tensor, tensor_type)
+            new_traceless_ricci_tensor = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             if tensor_type == 'dd':
@@ -207,13 +217,11 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
                 return '$$Z^{{{0} {1}}} = {2}$$'.format(latex(component[0]), latex(component[1]), latex(new_traceless_ricci_tensor[i, j]))
 
     elif tensor_object == 'Einstein Tensor':
-        et = EinsteinTensor(metric_tensor, coord_sys)
-        einstein_tensor = et.get_einsteintensor()
+        einstein_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$G_{{{0} {1}}} = {2}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(einstein_tensor[0][0]))
         else:
-            new_einstein_tensor = et.vary_einsteintensor_type(
-                einstein_tensor, tensor_type)
+            new_einstein_tensor = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             if tensor_type == 'dd':
@@ -224,13 +232,11 @@ def tensor_component_ep(metric_tensor, coord_sys, tensor_object, tensor_type='',
                 return '$$G^{{{0} {1}}} = {2}$$'.format(latex(component[0]), latex(component[1]), latex(new_einstein_tensor[i, j]))
 
     elif tensor_object == 'Weyl Tensor':
-        wyl = WeylTensor(metric_tensor, coord_sys)
-        weyl_tensor = wyl.get_weyltensor()
+        weyl_tensor = spacetime.get_tensor(tensor_object)
         if component == '':   # default case
             return '$$C_{{{0} {1} {2} {3}}} = {4}$$'.format(latex(coord_sys[0]), latex(coord_sys[0]), latex(coord_sys[0]), latex(coord_sys[0]), latex(weyl_tensor[0][0][0][0]))
         else:
-            new_weyl_tensor = wyl.vary_weyltensor_type(
-                weyl_tensor, tensor_type)
+            new_weyl_tensor = spacetime.get_tensor(tensor_object, tensor_type)
             i = coord_sys.index(component[0])
             j = coord_sys.index(component[1])
             k = coord_sys.index(component[2])
@@ -4,33 +4,53 @@ import PySimpleGUI as sg
 
 from display3D.mainpage import grtc_gui3d
 from display4D.mainpage import grtc_gui4d
+from objects.diskcache import set_disk_cache
+from objects.simplifyobjects import set_simplify_workers
 
 
 # Color theme option, provided by the PySimpleGUI
 sg.ChangeLookAndFeel('SandyBeach')
 
+# The number of worker processes that simplify the components of the tensors in parallel. None
+# uses all the cores of the machine and 1 simplifies the components serially
+simplify_workers = None
+
+# The directory of the cache of the computed tensors on the disk, which is shared by the sessions
+# of the program. None turns the cache off (e.g., objects.diskcache.default_disk_cache_dir turns it on)
+disk_cache_dir = None
+
 
 #---------- GRTC GUI - DIMENSIONS PAGE ----------#
 
 
-layout_dimension = [
-                        [sg.Text('General Relativity Tensorial Calculations (GRTC)', font=('Georgia', 14))],
-                        [sg.Text('Please Enter the Dimension of the Space:', font=('Tahoma', 11)),
-                         sg.InputCombo([3, 4], size=(8, 1), default_value='4', font=('Tahoma', 11))],
-                        [sg.Submit(button_color='blue'), sg.Exit(button_color='red')]
-                    ]
-
-window_dim = sg.Window('GRTC', layout_dimension)
-event, values = window_dim.read()
-ndim = values[0]
-if event == sg.WIN_CLOSED or event == 'Exit':
-    window_dim.close()
-if event == 'Submit':
-    window_dim.close()
-    if ndim == 4:
-        grtc_gui4d()   # if the dimesion is 4
-    else:
-        grtc_gui3d()   # if the dimesion is 3
+def grtc_gui():
+    """
+    The dimensions page of the GRTC, which opens the main page of the chosen dimension
+    """
+    layout_dimension = [
+                            [sg.Text('General Relativity Tensorial Calculations (GRTC)', font=('Georgia', 14))],
+                            [sg.Text('Please Enter the Dimension of the Space:', font=('Tahoma', 11)),
+                             sg.InputCombo([3, 4], size=(8, 1), default_value='4', font=('Tahoma', 11))],
+                            [sg.Submit(button_color='blue'), sg.Exit(button_color='red')]
+                        ]
+
+    window_dim = sg.Window('GRTC', layout_dimension)
+    event, values = window_dim.read()
+    ndim = values[0]
+    if event == sg.WIN_CLOSED or event == 'Exit':
+        window_dim.close()
+    if event == 'Submit':
+        window_dim.close()
+        if ndim == 4:
+            grtc_gui4d()   # if the dimesion is 4
+        else:
+            grtc_gui3d()   # if the dimesion is 3
+
+
+if __name__ == '__main__':   # the worker processes import this module, so the program runs only here
+    set_simplify_workers(simplify_workers)
+    set_disk_cache(disk_cache_dir)
+    grtc_gui()
 
 
 # The code block below will delete all the pycache folders after you stop running the program
@@ -0,0 +1,176 @@
+# Creating a contraction of symbolic tensors (e.g., raising and lowering their indices) that
+# only multiplies their nonzero components, instead of the object arrays of numpy.einsum
+
+from collections import defaultdict
+from itertools import product
+from math import prod
+
+from objects.packedtensor import PackedTensor
+from sympy import Add, Array, Mul, NDimArray, preorder_traversal, sympify
+
+
+def sparse_components(xtensor):
+    """
+    Finding the nonzero components of a given tensor
+
+    Args:
+        xtensor [sympy.tensor]: Given tensor (or a packed tensor, or a nested list of its components)
+
+    Returns:
+        [tuple]: The shape of the tensor and its nonzero components, by their indices
+    """
+    if not isinstance(xtensor, (NDimArray, PackedTensor)):
+        xtensor = Array(xtensor)
+    components = {}
+    for index in product(*(range(n) for n in xtensor.shape)):
+        component = sympify(xtensor[index])
+        if component != 0:
+            components[index] = component
+    return xtensor.shape, components
+
+
+def dense_tensor(components, shape):
+    """
+    Building a tensor of a given shape from its nonzero components. The components are placed in
+    a flat list, which is much faster than setting the components of a mutable array one by one
+
+    Args:
+        components [dict]: The nonzero components of the tensor, by their indices
+        shape [tuple]: The shape of the tensor
+    """
+    flat_components = [0] * prod(shape)
+    for index, component in components.items():
+        position = 0
+        for i, n in zip(index, shape):
+            position = position * n + i
+        flat_components[position] = component
+    return Array(flat_components, shape)
+
+
+def expression_size(components):
+    """
+    The total size (the number of nodes of the expression trees) of the components of a tensor,
+    which estimates the cost of the products that it takes part in
+
+    Args:
+        components [dict]: The nonzero components of the tensor
+    """
+    return sum(sum(1 for _ in preorder_traversal(component)) for component in components.values())
+
+
+def contract_pair(operand1, operand2, kept):
+    """
+    Contracting two sparse tensors over their common indices that are not kept. The components of
+    the second tensor are grouped by their common indices, so that only the pairs of nonzero
+    components whose common indices agree are multiplied
+
+    Args:
+        operand1, operand2 [tuple]: The index letters and the nonzero components of the tensors
+        kept [set]: The index letters that are kept (the ones of the result and of the other operands)
+
+    Returns:
+        [tuple]: The index letters and the nonzero components of the contracted tensor
+    """
+    letters1, components1 = operand1
+    letters2, components2 = operand2
+    common = [letter for letter in dict.fromkeys(letters1) if letter in letters2]
+    letters = ''.join(dict.fromkeys(letter for letter in letters1 + letters2 if letter in kept))
+    position1 = {letter: letters1.index(letter) for letter in letters1}
+    position2 = {letter: letters2.index(letter) for letter in letters2}
+    groups = defaultdict(list)
+    for index2, component2 in components2.items():
+        groups[tuple(index2[position2[letter]] for letter in common)].append((index2, component2))
+    terms = defaultdict(list)
+    for index1, component1 in components1.items():
+        for index2, component2 in groups.get(tuple(index1[position1[letter]] for letter in common), ()):
+            values = {letter: index1[position1[letter]] for letter in letters1}
+            values.update((letter, index2[position2[letter]]) for letter in letters2)
+            terms[tuple(values[letter] for letter in letters)].append(Mul(component1, component2))
+    components = {}
+    for index, products in terms.items():
+        component = Add(*products)
+        if component != 0:
+            components[index] = component
+    return letters, components
+
+
+def contract(subscripts, *xtensors):
+    """
+    Contracting symbolic tensors, given in the subscript notation of numpy.einsum (e.g.,
+    'abcd,bk->akcd' raises the second index of the riemann tensor). Only the nonzero components
+    are multiplied, so that the zeros of a sparse (e.g., diagonal) metric tensor are never
+    taken. With more than two tensors, the pair whose components are the smallest expressions
+    is contracted first
+
+    Args:
+        subscripts [str]: The index letters of each tensor and of the result, 'ij,jk->ik'
+        xtensors [sympy.tensor]: Given tensors
+
+    Returns:
+        [sympy.tensor]: The contracted tensor, unsimplified (or a scalar if it has no indices)
+    """
+    inputs, output = subscripts.replace(' ', '').split('->')
+    inputs = inputs.split(',')
+    if len(inputs) != len(xtensors):
+        raise ValueError('The subscripts do not match the number of tensors: {0}'.format(subscripts))
+    dimensions = {}
+    operands = []
+    for letters, xtensor in zip(inputs, xtensors):
+        shape, components = sparse_components(xtensor)
+        if len(letters) != len(shape):
+            raise ValueError('The subscripts do not match the rank of a tensor: {0}'.format(subscripts))
+        dimensions.update(zip(letters, shape))
+        diagonal = [(a, letters.index(letter)) for a, letter in enumerate(letters) if letters.index(letter) != a]
+        if diagonal:   # a repeated letter takes the diagonal of the tensor
+            components = {index: component for index, component in components.items()
+                          if all(index[a] == index[b] for a, b in diagonal)}
+        operands.append((letters, components))
+    while len(operands) > 1:
+        if len(operands) == 2:   # the order is only chosen between more than two tensors
+            first, second = 0, 1
+        else:
+            sizes = [expression_size(components) for _, components in operands]
+            first, second = min(((a, b) for a in range(len(operands)) for b in range(a + 1, len(operands))),
+                                key=lambda pair: sizes[pair[0]] * sizes[pair[1]])
+        kept = set(output).union(*(letters for c, (letters, _) in enumerate(operands) if c not in (first, second)))
+        contracted = contract_pair(operands[first], operands[second], kept)
+        operands = [operand for c, operand in enumerate(operands) if c not in (first, second)] + [contracted]
+    letters, components = operands[0]
+    if letters != output:   # the indices of the result are reordered (and the others summed over)
+        terms = defaultdict(list)
+        for index, component in components.items():
+            values = dict(zip(letters, index))
+            terms[tuple(values[letter] for letter in output)].append(component)
+        components = {index: Add(*products) for index, products in terms.items()}
+    if output == '':
+        return components.get((), sympify(0))
+    return dense_tensor(components, tuple(dimensions[letter] for letter in output))
+
+
+def scale_index(subscripts, xtensor, factors):
+    """
+    Contracting an index of a tensor with a diagonal tensor (e.g., raising an index with the
+    inverse of a diagonal metric tensor), given in the subscript notation of contract, e.g.
+    'abcd,bk->akcd'. Each component is only multiplied by the diagonal component of its index,
+    without any sum
+
+    Args:
+        subscripts [str]: The index letters of the tensor, of the diagonal tensor and of the result
+        xtensor [sympy.tensor]: Given tensor
+        factors [list]: The diagonal components of the diagonal tensor
+
+    Returns:
+        [sympy.tensor]: The contracted tensor, unsimplified
+    """
+    inputs, output = subscripts.replace(' ', '').split('->')
+    letters, diagonal_letters = inputs.split(',')
+    summed = diagonal_letters[0] if diagonal_letters[0] in letters else diagonal_letters[1]
+    new = diagonal_letters[1] if summed == diagonal_letters[0] else diagonal_letters[0]
+    shape, components = sparse_components(xtensor)
+    scaled = {}
+    for index, component in components.items():
+        values = dict(zip(letters, index))
+        values[new] = values[summed]
+        scaled[tuple(values[letter] for letter in output)] = factors[values[summed]] * component
+    return dense_tensor(scaled, tuple(shape[letters.index(letter)] if letter in letters else shape[letters.index(summed)]
+                                      for letter in output))
@@ -0,0 +1,155 @@
+# Creating a representation of tensors (and fields) in which the components share a table of
+# common subexpressions, found by common-subexpression elimination (cse)
+
+from objects.simplifyobjects import simplify_components
+from sympy import Array, Dummy, NDimArray, cse, latex, lambdify, numbered_symbols, sympify, tensorcontraction, tensorproduct
+
+
+class CSETensor(object):
+    def __init__(self, xtensor, strategy='none', subexpressions=None):
+        """
+        Creating the cse form of a given tensor. The common subexpressions of all components
+        (e.g., 1 - r_s/r or powers of sin(theta)) are stored once, in a table of symbols, and
+        the components are given in terms of these symbols. Each subexpression is simplified
+        only once, however many components it appears in
+
+        Args:
+            xtensor [sympy.tensor]: Given tensor (or scalar)
+            strategy [str]: The simplification tier of the subexpressions and the components;
+            'none', 'cheap', 'trig' or 'full'. Defaults to 'none'
+            subexpressions [list]: The table of the subexpressions, if the components of the
+            given tensor are already given in terms of its symbols. Found by cse (and simplified)
+            if it is not given
+
+        Returns:
+            self.shape [tuple]: The shape of the tensor, () for scalars
+            self.subexpressions [list]: The table of the subexpressions, as (symbol, subexpression)
+            pairs. A subexpression can contain the symbols of the previous ones
+            self.components [list]: The components of the tensor in terms of the symbols
+            of the table, in the order of the flattened tensor
+        """
+        if isinstance(xtensor, NDimArray):
+            self.shape = xtensor.shape
+            components = list(xtensor.reshape(len(xtensor))) if len(self.shape) > 0 else [xtensor[()]]
+        else:
+            self.shape = ()
+            components = [sympify(xtensor)]
+        if subexpressions is None:
+            subexpressions, components = cse(components, symbols=numbered_symbols('xi', cls=Dummy), order='none')
+            values = simplify_components([value for _, value in subexpressions], strategy)
+            subexpressions = [(symbol, value) for (symbol, _), value in zip(subexpressions, values)]
+        self.subexpressions = list(subexpressions)
+        self.components = simplify_components(components, strategy)
+        self.expanded_subexpressions = None
+
+    def __getitem__(self, index):
+        """
+        Returns a component of the tensor, with its subexpressions substituted back
+
+        Args:
+            index [tuple]: The index of the component
+        """
+        if not isinstance(index, tuple):
+            index = (index,)
+        position = 0
+        for i, n in zip(index, self.shape):
+            position = position * n + i
+        return self.components[position].xreplace(self.get_expanded_subexpressions())
+
+    def get_expanded_subexpressions(self):
+        """
+        Returns the subexpressions of the table in terms of the coordinates, i.e. with the
+        symbols of the previous subexpressions substituted back. They are found only once
+        """
+        if self.expanded_subexpressions is None:
+            self.expanded_subexpressions = {}
+            for symbol, value in self.subexpressions:
+                self.expanded_subexpressions[symbol] = value.xreplace(self.expanded_subexpressions)
+        return self.expanded_subexpressions
+
+    def get_tensor(self):
+        """
+        Returns the tensor (or scalar) with its subexpressions substituted back
+        """
+        expanded_subexpressions = self.get_expanded_subexpressions()
+        components = [component.xreplace(expanded_subexpressions) for component in self.components]
+        if self.shape == ():
+            return components[0]
+        return Array(components, self.shape)
+
+    def get_reduced_tensor(self):
+        """
+        Returns the tensor (or scalar) in terms of the symbols of the subexpression table
+        """
+        if self.shape == ():
+            return self.components[0]
+        return Array(self.components, self.shape)
+
+    def contract(self, xtensor, index1, index2, strategy='none'):
+        """
+        Contracting an index of the tensor with an index of another tensor (e.g., lowering an
+        index with the metric tensor). The contraction is taken in the cse form, so that the
+        subexpression table is shared by the result
+
+        Args:
+            xtensor [sympy.tensor/CSETensor]: Given tensor
+            index1 [int]: The index of this tensor
+            index2 [int]: The index of the given tensor
+            strategy [str]: The simplification tier of the components of the result. Defaults to 'none'
+
+        Returns:
+            [CSETensor]: The contracted tensor, A[..., a, ...] B[..., a, ...], whose indices are the
+            remaining ones of this tensor followed by the remaining ones of the given tensor
+        """
+        subexpressions = list(self.subexpressions)
+        if isinstance(xtensor, CSETensor):
+            symbols = {symbol for symbol, _ in subexpressions}
+            subexpressions += [(symbol, value) for symbol, value in xtensor.subexpressions if symbol not in symbols]
+            xtensor = xtensor.get_reduced_tensor()
+        contracted = tensorcontraction(tensorproduct(self.get_reduced_tensor(), Array(xtensor)),
+                                       (index1, len(self.shape) + index2))
+        return CSETensor(contracted, strategy, subexpressions=subexpressions)
+
+    def latex(self):
+        """
+        Returns the LaTeX code of the tensor in the cse form, i.e. the subexpression table
+        followed by the tensor in terms of its symbols
+        """
+        lines = ['{0} &= {1}'.format(latex(symbol), latex(value)) for symbol, value in self.subexpressions]
+        lines.append('&' + latex(self.get_reduced_tensor()))
+        return '\\begin{aligned}' + ' \\\\ '.join(lines) + '\\end{aligned}'
+
+    def evaluate(self, point):
+        """
+        Evaluating the tensor numerically at a given point. Each subexpression is evaluated only once
+
+        Args:
+            point [dict]: The values of the coordinates (and the other symbols of the tensor)
+
+        Returns:
+            The numerical tensor (or scalar)
+        """
+        values = {sympify(symbol): sympify(value) for symbol, value in point.items()}
+        for symbol, value in self.subexpressions:
+            values[symbol] = value.xreplace(values).evalf()
+        components = [component.xreplace(values).evalf() for component in self.components]
+        if self.shape == ():
+            return components[0]
+        return Array(components, self.shape)
+
+    def lambdify(self, args, modules=None):
+        """
+        Creating a numerical function of the tensor that evaluates each subexpression only once
+
+        Args:
+            args [list]: The arguments of the function (e.g., the coordinates)
+            modules [str]: The numerical module of the function (see sympy.lambdify)
+
+        Returns:
+            The function, which gives the components in the order of the flattened tensor
+        """
+        def reuse_subexpressions(expressions):   # the table of the tensor, with the ones that the given expressions still share
+            subexpressions, reduced_expressions = cse(expressions, symbols=numbered_symbols('eta', cls=Dummy), order='none')
+            return self.subexpressions + subexpressions, reduced_expressions
+
+        return lambdify(args, self.components, modules=modules, cse=reuse_subexpressions)
@@ -0,0 +1,82 @@
+# Creating a table of partial derivatives that is shared by all objects (fields and tensors)
+
+from itertools import product
+
+from objects.simplifyobjects import Diff, Simplify
+from sympy import sympify
+
+
+def tensor_pattern(xtensor, coord_sys):
+    """
+    Finding the nonzero components of a given tensor and the coordinates that they depend on
+
+    Args:
+        xtensor [sympy.tensor]: Given tensor
+        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+
+    Returns:
+        [dict]: The indices of the nonzero components, with the set of the indices of the
+        coordinates that they depend on
+    """
+    coord_indices = {coord: a for a, coord in enumerate(coord_sys)}
+    pattern = {}
+    for index in product(*(range(n) for n in xtensor.shape)):
+        component = sympify(xtensor[index])
+        if component != 0:
+            pattern[index] = frozenset(coord_indices[symbol] for symbol in component.free_symbols
+                                       if symbol in coord_indices)
+    return pattern
+
+
+class DerivativeTable(object):
+    def __init__(self, xtensor, coord_sys, symmetric=False, strategy='cheap', pattern=None):
+        """
+        Creating the table of the partial derivatives of a given tensor. Each derivative
+        d_i T[index] is taken (and simplified) only once, on its first access. The derivatives
+        of the zero components, and the ones with respect to the coordinates that a component
+        does not depend on, are zero without any differentiation
+
+        Args:
+            xtensor [sympy.tensor]: Given tensor (metric tensor, christoffel symbol, field, etc.)
+            coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            symmetric [bool]: Whether the tensor is symmetric in its last two indices,
+            so that d_i T[..., j, k] and d_i T[..., k, j] are taken only once
+            strategy [str]: The simplification tier of the derivatives. Defaults to 'cheap'
+            pattern [dict]: The nonzero components of the tensor with the coordinates that they
+            depend on (see tensor_pattern). Found from the tensor if it is not given
+
+        Returns:
+            self.derivatives [dict]: The derivatives that are computed so far, d_i T[index]
+            self.pattern [dict]: The nonzero components of the tensor
+        """
+        self.xtensor = xtensor
+        self.coord_sys = coord_sys
+        self.ndim = len(coord_sys)
+        self.symmetric = symmetric
+        self.strategy = strategy
+        self.pattern = tensor_pattern(xtensor, coord_sys) if pattern is None else pattern
+        self.derivatives = {}
+
+    def __getitem__(self, index):
+        """
+        Returns the partial derivative of the tensor component T[index[1:]] with respect
+        to the [index[0]]'th component of the coordinate system
+
+        Args:
+            index [tuple]: Coordinate indices; (0-ndim)
+        """
+        i, component = index[0], tuple(index[1:])
+        if self.symmetric and component[-2] > component[-1]:
+            component = component[:-2] + (component[-1], component[-2])
+        if i not in self.pattern.get(component, ()):
+            return 0
+        if (i, component) not in self.derivatives:
+            self.derivatives[i, component] = Simplify(
+                Diff(self.xtensor[component], self.coord_sys[i]), self.strategy)
+        return self.derivatives[i, component]
+
+    def __len__(self):
+        """
+        Returns the number of derivatives that are computed so far
+        """
+        return len(self.derivatives)
@@ -0,0 +1,282 @@
+# Creating a cache of the computed tensors on the disk, which is shared by all sessions (and
+# processes) of the program
+
+import ast
+import os
+import time
+import zlib
+from hashlib import sha256
+from tempfile import mkstemp
+
+import sympy
+from objects.packedtensor import PackedTensor
+from sympy import Array, Basic, NDimArray, Tuple, srepr, sympify
+
+
+def source_hash():
+    """
+    Finding the hash of the source of the objects package (the curvature engines, the
+    simplification, etc.), so that the tensors that an older source computed are never read
+
+    Returns:
+        [str]: The hash of the source files, in the order of their paths
+    """
+    source = sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = []
+    for directory, _, files in os.walk(package_dir):
+        paths.extend(os.path.join(directory, name) for name in files if name.endswith('.py'))
+    for path in sorted(paths):
+        source.update(os.path.relpath(path, package_dir).encode())
+        with open(path, 'rb') as source_file:
+            source.update(source_file.read())
+    return source.hexdigest()
+
+
+# The version of the key schema and of the file format, i.e. the hash of the source. It is found
+# on the first use of the cache (see get_disk_cache_version). The entries of the other versions
+# are never read, and they are evicted as the least recently used ones
+disk_cache_version = None
+
+# The names that the srepr form of a cached tensor may use, i.e. the classes and the constants of
+# sympy, and the classes whose string arguments are taken as they are (see parse_srepr)
+srepr_names = {name: value for name, value in vars(sympy).items()
+               if isinstance(value, Basic) or isinstance(value, type) and issubclass(value, Basic)}
+srepr_string_classes = ('Symbol', 'Dummy', 'Function', 'Float')
+
+# The directory of the cache and its size limit (in bytes). The cache is off (None directory)
+# unless it is turned on by set_disk_cache, which uses default_disk_cache_dir by default
+default_disk_cache_dir = os.path.join(os.path.expanduser('~'), '.grtcgui', 'cache')
+disk_cache_dir = None
+max_disk_cache_size = 256 * 2**20
+
+# The time (in seconds) that a process waits for the lock of the cache, and the age of a lock
+# that is taken as left behind by a crashed process
+disk_cache_lock_timeout = 5
+disk_cache_stale_lock = 60
+
+
+def get_disk_cache_version():
+    """
+    Returns the version of the disk cache, hashing the source only on the first call
+    """
+    global disk_cache_version
+    if disk_cache_version is None:
+        disk_cache_version = source_hash()
+    return disk_cache_version
+
+
+def parse_srepr(text):
+    """
+    Parsing the srepr form of a cached tensor. The files of the cache may be written by any user
+    of its directory, so the form is checked to be only calls of the sympy classes with literal
+    arguments (the strings only as the names of the symbols and the functions, or the values of
+    the floats) before it is evaluated, without the builtins
+
+    Args:
+        text [str]: The srepr form
+
+    Returns:
+        The sympy object of the form
+    """
+    tree = ast.parse(text, mode='eval')
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in srepr_string_classes:
+            names.update(id(argument) for argument in node.args[:1])
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id not in srepr_names or not isinstance(node.ctx, ast.Load):
+                raise ValueError('Unknown name in the srepr form: {0}'.format(node.id))
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, str) and id(node) not in names or \
+                    not isinstance(node.value, (str, int, float, bool, type(None))):
+                raise ValueError('Unexpected constant in the srepr form: {0!r}'.format(node.value))
+        elif not isinstance(node, (ast.Expression, ast.Call, ast.keyword, ast.Tuple, ast.List, ast.UnaryOp,
+                                   ast.USub, ast.Load)):
+            raise ValueError('Unexpected {0} in the srepr form'.format(type(node).__name__))
+    return eval(compile(tree, '<disk cache>', 'eval'), {'__builtins__': {}}, dict(srepr_names))
+
+
+def set_disk_cache(directory=default_disk_cache_dir, max_size=max_disk_cache_size):
+    """
+    Turning the disk cache on (or off), with its directory and its size limit
+
+    Args:
+        directory [str]: The directory of the cache. None turns the cache off. Defaults to
+        default_disk_cache_dir
+        max_size [int]: The size limit of the cache in bytes
+    """
+    global disk_cache_dir, max_disk_cache_size
+    disk_cache_dir = directory
+    max_disk_cache_size = max_size
+
+
+def disk_cache_key(metric_tensor, coord_sys, tensor_object, tensor_type, strategy, engine='coordinate', coframe=None):
+    """
+    Finding the key of a tensor, i.e. the hash of the canonical (srepr) form of the metric
+    tensor, the coordinate system and the requested tensor, with the hash of the source. None
+    if the cache is off
+
+    Args:
+        metric_tensor [list]: The metric tensor, provided by the user
+        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+        tensor_object [str]: The name of the grtensor object (metric tensor, riemann tensor, etc.)
+        tensor_type [str]: The type of the tensor, '' for the default type
+        strategy [str]: The simplification tier of the tensor
+        engine [str]: The algorithm of the riemann tensor. Defaults to 'coordinate'
+        coframe [list]: The coframe of the 'cartan' engine, None if it is built from the metric
+    """
+    if disk_cache_dir is None:
+        return None
+    canonical_coframe = '' if coframe is None else srepr(Tuple(*[sympify(component) for row in coframe for component in row]))
+    canonical_form = '|'.join([get_disk_cache_version(),
+                               srepr(Tuple(*[sympify(component) for row in metric_tensor for component in row])),
+                               srepr(Tuple(*coord_sys)), tensor_object, tensor_type, strategy, engine,
+                               canonical_coframe])
+    return sha256(canonical_form.encode()).hexdigest()
+
+
+def disk_cache_path(key):
+    """
+    Returns the file of a given key
+
+    Args:
+        key [str]: The key of the tensor
+    """
+    return os.path.join(disk_cache_dir, key + '.srepr.z')
+
+
+def load_tensor(key):
+    """
+    Loading a tensor from the disk cache. The file of the tensor is touched, so that the
+    eviction finds the least recently used tensors by their modification times
+
+    Args:
+        key [str]: The key of the tensor
+
+    Returns:
+        The tensor (or scalar), or None if it is not cached (or its file is corrupt)
+    """
+    if disk_cache_dir is None or key is None:
+        return None
+    path = disk_cache_path(key)
+    try:
+        with open(path, 'rb') as cache_file:
+            header, shape, components = zlib.decompress(cache_file.read()).decode().split('\n', 2)
+        if header != 'grtcgui-cache {0}'.format(get_disk_cache_version()):
+            return None
+        components = parse_srepr(components)
+        os.utime(path)
+    except Exception:   # a missing, corrupt (or evicted) file is taken as a miss
+        return None
+    if shape == '':
+        return components[0]
+    return Array(list(components), tuple(int(n) for n in shape.split(',')))
+
+
+def store_tensor(key, xtensor):
+    """
+    Storing a tensor in the disk cache, as the compressed srepr form of its components. The
+    file is written under a temporary name and then renamed, so that the other processes
+    never read a partly written file
+
+    Args:
+        key [str]: The key of the tensor
+        xtensor [sympy.tensor]: Given tensor (or scalar)
+    """
+    if disk_cache_dir is None or key is None:
+        return
+    if isinstance(xtensor, (NDimArray, PackedTensor)):   # a packed tensor is stored with all its components
+        shape = ','.join(str(n) for n in xtensor.shape)
+        components = list(xtensor.reshape(len(xtensor)))
+    else:
+        shape, components = '', [xtensor]
+    data = '\n'.join(['grtcgui-cache {0}'.format(get_disk_cache_version()), shape,
+                      srepr(Tuple(*[sympify(component) for component in components]))])
+    try:
+        os.makedirs(disk_cache_dir, exist_ok=True)
+        descriptor, temporary_path = mkstemp(dir=disk_cache_dir, suffix='.tmp')
+    except OSError:   # the cache is not writable, so the tensor is not cached
+        return
+    try:
+        with os.fdopen(descriptor, 'wb') as cache_file:
+            cache_file.write(zlib.compress(data.encode()))
+        os.replace(temporary_path, disk_cache_path(key))
+    except OSError:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        return
+    evict_tensors()
+
+
+def acquire_disk_cache_lock():
+    """
+    Acquiring the lock of the disk cache by creating the lock file, which fails while another
+    process holds it. A lock that is older than disk_cache_stale_lock is removed
+
+    Returns:
+        [bool]: Whether the lock is acquired within disk_cache_lock_timeout
+    """
+    lock_path = os.path.join(disk_cache_dir, 'cache.lock')
+    deadline = time.time() + disk_cache_lock_timeout
+    while time.time() < deadline:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > disk_cache_stale_lock:
+                    os.remove(lock_path)
+            except OSError:
+                pass
+            time.sleep(0.01)
+        except OSError:
+            return False
+    return False
+
+
+def release_disk_cache_lock():
+    """
+    Releasing the lock of the disk cache
+    """
+    try:
+        os.remove(os.path.join(disk_cache_dir, 'cache.lock'))
+    except OSError:
+        pass
+
+
+def evict_tensors():
+    """
+    Removing the least recently used tensors from the disk cache until its size is within
+    max_disk_cache_size. Only one process evicts at a time
+    """
+    try:
+        entries = [entry for entry in os.scandir(disk_cache_dir) if entry.name.endswith('.srepr.z')]
+        if sum(entry.stat().st_size for entry in entries) <= max_disk_cache_size:
+            return
+    except OSError:
+        return
+    if not acquire_disk_cache_lock():
+        return
+    try:
+        files = []
+        for entry in os.scandir(disk_cache_dir):
+            if entry.name.endswith('.srepr.z'):
+                try:
+                    files.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+                except OSError:   # removed by another process
+                    pass
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= max_disk_cache_size:
+                break
+            try:
+                os.remove(path)
+                size -= file_size
+            except OSError:
+                pass
+    finally:
+        release_disk_cache_lock()
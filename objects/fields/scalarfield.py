@@ -1,5 +1,6 @@
+from objects.derivativetable import DerivativeTable
 from objects.simplifyobjects import Simplify
-from sympy import diff
+from sympy import Array
 
 
 class ScalarField():
@@ -14,6 +15,8 @@ class ScalarField():
         self.coord_sys = coord_sys
         self.scalar_field = scalar_field
         self.ndim = len(coord_sys)
+        self.scalar_field_derivatives = DerivativeTable(
+            Array([scalar_field]), coord_sys, strategy='none')
 
     def get_scalarfield(self):
         """
@@ -28,7 +31,7 @@ class ScalarField():
         Args:
             index [int]: The index of the coordinate system given as an integer; (0-ndim)
         """
-        return Simplify(diff(self.scalar_field, self.coord_sys[index]))
+        return Simplify(self.scalar_field_derivatives[index, 0])
 
     def cal_lie_derivative(self, X):
         """
@@ -39,5 +42,5 @@ class ScalarField():
         """
         ld_scalar_field = 0
         for c in range(self.ndim):
-            ld_scalar_field += X[c]*diff(self.scalar_field, self.coord_sys[c])
+            ld_scalar_field += X[c]*self.scalar_field_derivatives[c, 0]
         return Simplify(ld_scalar_field)
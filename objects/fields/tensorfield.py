@@ -1,9 +1,9 @@
 from itertools import product
 
-from numpy import zeros
-from objects.grtensors.christoffelsymbol import ChristoffelSymbol
+from objects.derivativetable import DerivativeTable
+from objects.grtensors.spacetime import get_spacetime
 from objects.simplifyobjects import Simplify
-from sympy import MutableDenseNDimArray, diff
+from sympy import Array, MutableDenseNDimArray
 
 
 class TensorField():
@@ -23,6 +23,8 @@ class TensorField():
         self.tensor_field = tensor_field
         self.tensor_field_type = tensor_field_type
         self.ndim = len(coord_sys)
+        self.tensor_field_derivatives = DerivativeTable(
+            Array(tensor_field), coord_sys, strategy='none')
 
     def get_tensorfield(self):
         """
@@ -43,13 +45,12 @@ class TensorField():
         Args:
             index [int]: The index of the coordinate system given as an integer; (0-ndim)
         """
-        cs = ChristoffelSymbol(self.metric_obj, self.coord_sys)
+        cs = get_spacetime(self.metric_obj, self.coord_sys).get_grtensor('Christoffel Symbol')
         chris_symbol = cs.get_christoffelsymbol()
-        cd_tensor_field = MutableDenseNDimArray(zeros((self.ndim,)*2))
+        cd_tensor_field = MutableDenseNDimArray.zeros(*(self.ndim,)*2)
         if self.tensor_field_type == 'uu':
             for a, b in product(range(self.ndim), repeat=2):
-                T_partial = diff(
-                    self.tensor_field[a][b], self.coord_sys[index])
+                T_partial = self.tensor_field_derivatives[index, a, b]
                 einstein_sum1, einstein_sum2 = 0, 0
                 for d in range(self.ndim):
                     einstein_sum1 += chris_symbol[a,
@@ -61,8 +62,7 @@ class TensorField():
 
         elif self.tensor_field_type == 'ud':
             for a, b in product(range(self.ndim), repeat=2):
-                T_partial = diff(
-                    self.tensor_field[a][b], self.coord_sys[index])
+                T_partial = self.tensor_field_derivatives[index, a, b]
                 einstein_sum1, einstein_sum2 = 0, 0
                 for d in range(self.ndim):
                     einstein_sum1 += chris_symbol[a,
@@ -74,8 +74,7 @@ class TensorField():
 
         elif self.tensor_field_type == 'dd':
             for a, b in product(range(self.ndim), repeat=2):
-                T_partial = diff(
-                    self.tensor_field[a][b], self.coord_sys[index])
+                T_partial = self.tensor_field_derivatives[index, a, b]
                 einstein_sum1, einstein_sum2 = 0, 0
                 for d in range(self.ndim):
                     einstein_sum1 += chris_symbol[d,
@@ -86,21 +85,23 @@ class TensorField():
                     einstein_sum1 - einstein_sum2
         return Simplify(cd_tensor_field)
 
-    def cal_lie_derivative(self, X):
+    def cal_lie_derivative(self, X, strategy='full'):
         """
         The lie derivative of a tensor field with respect to vector field, X
 
         Args:
            X [list]: Given vector field that the lie derivative is taken w.r.t
+           strategy [str]: The simplification tier of the lie derivative. Defaults to 'full'
         """
-        ld_tensor_field = MutableDenseNDimArray(zeros((self.ndim,)*2))
+        dX = DerivativeTable(Array(X), self.coord_sys, strategy='none')
+        ld_tensor_field = MutableDenseNDimArray.zeros(*(self.ndim,)*2)
         if self.tensor_field_type == 'uu':
             for a, b in product(range(self.ndim), repeat=2):
                 einstein_sum = 0
                 for c in range(self.ndim):
-                    S1 = X[c]*diff(self.tensor_field[a][b], self.coord_sys[c])
-                    S2 = self.tensor_field[c][b]*diff(X[a], self.coord_sys[c])
-                    S3 = self.tensor_field[a][c]*diff(X[b], self.coord_sys[c])
+                    S1 = X[c]*self.tensor_field_derivatives[c, a, b]
+                    S2 = self.tensor_field[c][b]*dX[c, a]
+                    S3 = self.tensor_field[a][c]*dX[c, b]
                     einstein_sum += S1 - S2 - S3
                 ld_tensor_field[a, b] = einstein_sum
 
@@ -108,9 +109,9 @@ class TensorField():
             for a, b in product(range(self.ndim), repeat=2):
                 einstein_sum = 0
                 for c in range(self.ndim):
-                    S1 = X[c]*diff(self.tensor_field[a][b], self.coord_sys[c])
-                    S2 = self.tensor_field[c][b]*diff(X[a], self.coord_sys[c])
-                    S3 = self.tensor_field[a][c]*diff(X[c], self.coord_sys[b])
+                    S1 = X[c]*self.tensor_field_derivatives[c, a, b]
+                    S2 = self.tensor_field[c][b]*dX[c, a]
+                    S3 = self.tensor_field[a][c]*dX[b, c]
                     einstein_sum += S1 - S2 + S3
                 ld_tensor_field[a, b] = einstein_sum
 
@@ -118,9 +119,9 @@ class TensorField():
             for a, b in product(range(self.ndim), repeat=2):
                 einstein_sum = 0
                 for c in range(self.ndim):
-                    S1 = X[c]*diff(self.tensor_field[a][b], self.coord_sys[c])
-                    S2 = self.tensor_field[c][b]*diff(X[c], self.coord_sys[a])
-                    S3 = self.tensor_field[a][c]*diff(X[c], self.coord_sys[b])
+                    S1 = X[c]*self.tensor_field_derivatives[c, a, b]
+                    S2 = self.tensor_field[c][b]*dX[a, c]
+                    S3 = self.tensor_field[a][c]*dX[b, c]
                     einstein_sum += S1 + S2 + S3
                 ld_tensor_field[a, b] = einstein_sum
-        return Simplify(ld_tensor_field)
+        return Simplify(ld_tensor_field, strategy)
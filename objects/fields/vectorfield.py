@@ -1,9 +1,9 @@
-from numpy import einsum, zeros
+from objects.derivativetable import DerivativeTable
 from objects.fields.tensorfield import TensorField
-from objects.grtensors.christoffelsymbol import ChristoffelSymbol
-from objects.grtensors.metrictensor import MetricTensor
+from objects.grtensors.spacetime import get_spacetime
 from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray, diff
+from objects.zerotest import is_zero
+from sympy import Array
 
 
 class VectorField():
@@ -23,6 +23,8 @@ class VectorField():
         self.vector_field = vector_field
         self.vector_field_type = vector_field_type
         self.ndim = len(coord_sys)
+        self.vector_field_derivatives = DerivativeTable(
+            Array(vector_field), coord_sys, strategy='none')
 
     def get_vectorfield(self):
         """
@@ -43,12 +45,12 @@ class VectorField():
         Args:
             index [int]: The index of the coordinate system given as an integer; (0-ndim)
         """
-        cs = ChristoffelSymbol(self.metric_obj, self.coord_sys)
+        cs = get_spacetime(self.metric_obj, self.coord_sys).get_grtensor('Christoffel Symbol')
         chris_symbol = cs.get_christoffelsymbol()
         cd_vector_field = []
         if self.vector_field_type == 'u':
             for a in range(self.ndim):
-                V_partial = diff(self.vector_field[a], self.coord_sys[index])
+                V_partial = self.vector_field_derivatives[index, a]
                 einstein_sum = 0
                 for b in range(self.ndim):
                     einstein_sum += chris_symbol[a,
@@ -58,7 +60,7 @@ class VectorField():
 
         elif self.vector_field_type == 'd':
             for a in range(self.ndim):
-                V_partial = diff(self.vector_field[a], self.coord_sys[index])
+                V_partial = self.vector_field_derivatives[index, a]
                 einstein_sum = 0
                 for b in range(self.ndim):
                     einstein_sum += chris_symbol[b,
@@ -74,32 +76,35 @@ class VectorField():
         Args:
             X [list]: Given vector field that the lie derivative is taken w.r.t
         """
+        dX = DerivativeTable(Array(X), self.coord_sys, strategy='none')
         ld_vector_field = []
         if self.vector_field_type == 'u':
             for a in range(self.ndim):
                 einstein_sum = 0
                 for c in range(self.ndim):
-                    einstein_sum += X[c]*diff(self.vector_field[a], self.coord_sys[c]) - \
-                        self.vector_field[c]*diff(X[a], self.coord_sys[c])
+                    einstein_sum += X[c]*self.vector_field_derivatives[c, a] - \
+                        self.vector_field[c]*dX[c, a]
                 ld_vector_field.append(einstein_sum)
 
         elif self.vector_field_type == 'd':
             for a in range(self.ndim):
                 einstein_sum = 0
                 for c in range(self.ndim):
-                    einstein_sum += X[c]*diff(self.vector_field[a], self.coord_sys[c]) + \
-                        self.vector_field[c]*diff(X[c], self.coord_sys[a])
+                    einstein_sum += X[c]*self.vector_field_derivatives[c, a] + \
+                        self.vector_field[c]*dX[a, c]
                 ld_vector_field.append(einstein_sum)
         return Simplify(Array(ld_vector_field))
 
     def isKillingField(self, xvector_field):
         """
-        Checking if a giving vector field with type (1,0) is a killing field or not
+        Checking if a giving vector field with type (1,0) is a killing field or not. The
+        components of the lie derivative of the metric tensor are checked by the zero test
+        (see objects.zerotest), before they are simplified. A component is taken as zero only
+        if it is confirmed symbolically, so the answer is not a probabilistic one
         """
         g = TensorField(self.metric_obj, self.coord_sys, self.metric_obj, 'dd')
-        if g.cal_lie_derivative(xvector_field) == MutableDenseNDimArray(zeros((4,)*2)):
-            return True
-        return False
+        ld_metric_tensor = g.cal_lie_derivative(xvector_field, 'none')
+        return all(is_zero(component) for component in ld_metric_tensor.reshape(len(ld_metric_tensor)))
 
     def vary_vectorfield_type(self, xvector_field, new_type):
         """
@@ -114,9 +119,9 @@ class VectorField():
             The new vector field for a given type
         """
         self.vector_field_type = new_type
+        mt = get_spacetime(self.metric_obj, self.coord_sys).get_grtensor('Inverse Metric Tensor')
         if new_type == 'u':
-            mt = MetricTensor(self.metric_obj, self.coord_sys)
             inverse_metric = mt.get_inverse()
-            return Simplify(Array(einsum('ij,i->j', inverse_metric, xvector_field, optimize='optimal')))
+            return Simplify(mt.contract_metric('i,ij->j', xvector_field, inverse_metric))
         elif new_type == 'd':
-            return Simplify(Array(einsum('ij,i->j', self.metric_obj, xvector_field, optimize='optimal')))
+            return Simplify(mt.contract_metric('i,ij->j', xvector_field, mt.metric_obj))
@@ -5,5 +5,6 @@ from .metrictensor import MetricTensor
 from .ricciscalar import RicciScalar
 from .riccitensor import RicciTensor
 from .riemanntensor import RiemannTensor
+from .spacetime import Spacetime, get_spacetime
 from .tracelessriccitensor import TracelessRicciTensor
 from .weyltensor import WeylTensor
\ No newline at end of file
@@ -0,0 +1,168 @@
+# Creating the curvature of a metric by the structure equations of cartan, in an orthonormal
+# coframe, as an alternative to the coordinate (christoffel symbol) route
+
+from itertools import product
+
+from objects.derivativetable import DerivativeTable
+from objects.grtensors.metrictensor import inverse_metric, metric_blocks
+from objects.simplifyobjects import Simplify, simplify_components
+from objects.zerotest import zero_test
+from sympy import Array, Matrix, MutableDenseNDimArray, Rational, eye, nan, sqrt, zoo
+
+
+def orthonormal_coframe(xmetric_tensor):
+    """
+    Building an orthonormal coframe of the metric tensor, e^a = E^a_mu dx^mu, by its LDL^T
+    decomposition, g = L D L^T, so that E = sqrt(eta D) L^T. Each sign eta_aa is the sign of
+    the leading term of D_aa. A diagonal metric gives E^a_a = sqrt(eta_aa g_aa)
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+
+    Returns:
+        [tuple]: The coframe, E[a, mu], and its (constant) metric, eta
+    """
+    ndim = xmetric_tensor.shape[0]
+    metric = Matrix(ndim, ndim, lambda i, j: xmetric_tensor[i, j])
+    if metric.is_diagonal():
+        lower, diagonal = eye(ndim), metric
+    else:
+        try:
+            lower, diagonal = metric.LDLdecomposition(hermitian=False)
+        except ValueError:
+            lower = None
+        if lower is None or lower.has(zoo, nan) or any(diagonal[a, a] == 0 for a in range(ndim)):
+            raise ValueError('An orthonormal coframe can not be built for this metric; please give the coframe')
+    signs = [-1 if diagonal[a, a].could_extract_minus_sign() else 1 for a in range(ndim)]
+    scale = Matrix.diag(*[sqrt(signs[a] * diagonal[a, a]) for a in range(ndim)])
+    return scale * lower.T, Matrix.diag(*signs)
+
+
+def invert_coframe(coframe):
+    """
+    Finding the frame, E_a^mu, as the inverse of the coframe. It is inverted block by block,
+    like the metric tensor (see metrictensor.inverse_metric)
+
+    Args:
+        coframe [Matrix]: The coframe, E[a, mu]
+
+    Returns:
+        [Matrix]: The frame, as frame[mu, a]
+    """
+    xcoframe = Array(coframe.tolist())
+    return Matrix(inverse_metric(xcoframe, metric_blocks(xcoframe)).tolist())
+
+
+def frame_metric(xmetric_tensor, coframe, frame):
+    """
+    Finding the metric of a given coframe, eta_ab = E_a^mu E_b^nu g_mu nu, which must be constant
+    (e.g., diag(-1, 1, 1, 1)) for the coframe to be orthonormal
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+        coframe [Matrix]: The coframe, E[a, mu]
+        frame [Matrix]: The frame, as frame[mu, a]
+
+    Returns:
+        [Matrix]: The metric of the coframe
+    """
+    ndim = xmetric_tensor.shape[0]
+    metric = Matrix(ndim, ndim, lambda i, j: xmetric_tensor[i, j])
+    eta = simplify_components(list(frame.T * metric * frame), 'cheap')
+    eta = [component if component.is_Number else simplify_components([component], 'full')[0] for component in eta]
+    if not all(component.is_Number for component in eta):
+        raise ValueError('The given coframe is not orthonormal: its metric is not constant')
+    return Matrix(ndim, ndim, eta)
+
+
+def cartan_riemann(xmetric_tensor, coord_sys, coframe=None, strategy='cheap', independent=True):
+    """
+    Calculating the riemann tensor by the structure equations of cartan. The connection one-forms
+    are found from the exterior derivative of the coframe, de^a = -w^a_b ^ e^b, and the curvature
+    two-forms from them, W^a_b = dw^a_b + w^a_c ^ w^c_b. Only the frame components that are
+    needed are taken, and the result is transformed back to the coordinate components
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+        coframe [list]: The orthonormal coframe, E[a][mu]. Built by orthonormal_coframe if it is
+        not given
+        strategy [str]: The simplification tier of the connection and the curvature forms.
+        Defaults to 'cheap'
+        independent [bool]: Computing only the components of the riemann tensor that are not
+        fixed by its antisymmetry in i and j. Defaults to True
+
+    Returns:
+        [sympy.tensor]: The riemann tensor, R^l_ijk, in the index convention of RiemannTensor
+    """
+    ndim = len(coord_sys)
+    if coframe is None:
+        coframe, eta = orthonormal_coframe(xmetric_tensor)
+        frame = invert_coframe(coframe)   # E_a^mu, as frame[mu, a]
+    else:
+        coframe = Matrix(coframe)
+        frame = invert_coframe(coframe)
+        eta = frame_metric(xmetric_tensor, coframe, frame)
+    inverse_eta = eta.inv()
+    diagonal_eta = eta.is_diagonal()   # w^a_b and W^a_b are then fixed by w^b_a and W^b_a for a > b
+    dE = DerivativeTable(Array(coframe.tolist()), coord_sys, strategy=strategy)
+    # de^a = 1/2 D^a_bc e^b ^ e^c, with D_abc lowered by eta
+    exterior_derivative = MutableDenseNDimArray.zeros(ndim, ndim, ndim)
+    for a, b, c in product(range(ndim), repeat=3):
+        if b >= c:
+            exterior_derivative[a, b, c] = -exterior_derivative[a, c, b] if b > c else 0
+            continue
+        einstein_sum = 0
+        for mu, nu in product(range(ndim), repeat=2):
+            if frame[mu, b] != 0 and frame[nu, c] != 0:
+                einstein_sum += frame[mu, b] * frame[nu, c] * (dE[mu, a, nu] - dE[nu, a, mu])
+        exterior_derivative[a, b, c] = einstein_sum
+    lowered = MutableDenseNDimArray.zeros(ndim, ndim, ndim)
+    for a, b, c in product(range(ndim), repeat=3):
+        lowered[a, b, c] = sum(eta[a, d] * exterior_derivative[d, b, c] for d in range(ndim) if eta[a, d] != 0)
+    # the connection one-forms, w^a_b = w^a_bmu dx^mu, from w_abc = (D_abc + D_bca - D_cab)/2
+    connection = MutableDenseNDimArray.zeros(ndim, ndim, ndim)
+    for a, b, mu in product(range(ndim), repeat=3):
+        if diagonal_eta and a >= b:
+            connection[a, b, mu] = -eta[a, a] * eta[b, b] * connection[b, a, mu] if a > b else 0
+            continue
+        einstein_sum = 0
+        for d, c in product(range(ndim), repeat=2):
+            if inverse_eta[a, d] != 0 and coframe[c, mu] != 0:
+                einstein_sum += inverse_eta[a, d] * Rational(1, 2) * (lowered[d, b, c] + lowered[b, c, d] - lowered[c, d, b]) * coframe[c, mu]
+        connection[a, b, mu] = einstein_sum
+    connection = Simplify(connection, strategy)
+    dw = DerivativeTable(connection, coord_sys, strategy=strategy)
+    # the curvature two-forms, W^a_bmunu = d_mu w^a_bnu - d_nu w^a_bmu + w^a_cmu w^c_bnu - w^a_cnu w^c_bmu
+    curvature = {}
+    for a, b, mu, nu in product(range(ndim), repeat=4):
+        if mu < nu and not (diagonal_eta and a >= b):
+            einstein_sum = dw[mu, a, b, nu] - dw[nu, a, b, mu]
+            for c in range(ndim):
+                einstein_sum += connection[a, c, mu] * connection[c, b, nu] - connection[a, c, nu] * connection[c, b, mu]
+            curvature[a, b, mu, nu] = einstein_sum
+    indices = list(curvature)
+    curvature = dict(zip(indices, simplify_components([curvature[index] for index in indices], strategy)))
+    if diagonal_eta:
+        for a, b, mu, nu in indices:
+            curvature[b, a, mu, nu] = -eta[a, a] * eta[b, b] * curvature[a, b, mu, nu]
+        for a, mu, nu in product(range(ndim), repeat=3):
+            if mu < nu:
+                curvature[a, a, mu, nu] = 0
+    # R^l_ijk = E_a^l W^a_bji E^b_k, with W^a_bij = -W^a_bji
+    riemann_tensor = MutableDenseNDimArray.zeros(*(ndim,)*4)
+    for l, i, j, k in product(range(ndim), repeat=4):
+        if i >= j:
+            if independent or i == j:
+                riemann_tensor[l, i, j, k] = -riemann_tensor[l, j, i, k] if i > j else 0
+                continue
+        einstein_sum = 0
+        for a, b in product(range(ndim), repeat=2):
+            if frame[l, a] != 0 and coframe[b, k] != 0:
+                two_form = curvature[a, b, j, i] if j < i else -curvature[a, b, i, j]
+                einstein_sum += frame[l, a] * two_form * coframe[b, k]
+        if zero_test(einstein_sum):   # the terms cancel out (see objects.zerotest)
+            continue
+        riemann_tensor[l, i, j, k] = einstein_sum
+    # the square roots of the coframe mostly cancel out in the coordinate components
+    return Simplify(riemann_tensor, strategy)
@@ -1,59 +1,202 @@
 from itertools import product
 
-from numpy import einsum, zeros
+from objects.derivativetable import DerivativeTable
 from objects.grtensors.metrictensor import MetricTensor
-from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray, diff
+from objects.grtensors.rationalfield import rational_metric
+from objects.simplifyobjects import Simplify, intermediate_strategy
+from objects.zerotest import zero_test
+from sympy import Array, MutableDenseNDimArray, Rational
 
 
-def derivative_of_metric(coord_sys, metric_tensor, i, j, k):
+def christoffel_pattern(metric_pattern, inverse_metric_pattern, ndim):
     """
-    Taking the partial derivative of a given metric tensor [g_jk] with respect to the
-    [i]'th component
+    Finding the structurally nonzero components of the christoffel symbol, Gamma^m_ij, and the
+    coordinates that they depend on, from the ones of the metric tensor and its inverse. A term
+    g^mk d_j g_ki of the christoffel symbol is nonzero only if g^mk is nonzero and g_ki depends
+    on the j'th coordinate
 
     Args:
-        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
-        metric_tensor [sympy.tensor]: Given metric tensor, g_jk
-        i,j,k [int]: Coordinate indices; (0-ndim)
+        metric_pattern [dict]: The nonzero components of the metric tensor
+        inverse_metric_pattern [dict]: The nonzero components of the inverse metric tensor
+        ndim [int]: Dimension of the space
+
+    Returns:
+        [dict]: The indices of the nonzero components, with the set of the indices of the
+        coordinates that they depend on
     """
-    return Simplify(diff(metric_tensor[j, k], coord_sys[i]))
+    pattern = {}
+    for m, i, j in product(range(ndim), repeat=3):
+        if i > j:   # the christoffel symbol is symmetric in its lower indices
+            if (m, j, i) in pattern:
+                pattern[m, i, j] = pattern[m, j, i]
+            continue
+        dependence = None
+        for k in range(ndim):
+            if (m, k) not in inverse_metric_pattern:
+                continue
+            for index, a in (((k, i), j), ((k, j), i), ((i, j), k)):
+                if a in metric_pattern.get(index, ()):
+                    dependence = (dependence or frozenset()) | metric_pattern[index] | inverse_metric_pattern[m, k]
+        if dependence is not None:
+            pattern[m, i, j] = dependence
+    return pattern
 
 
 class ChristoffelSymbol(MetricTensor):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, strategy='full', engine='coordinate'):
         """
         Creating the christoffel symbol object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+            engine [str]: The algorithm of the curvature tensors. The christoffel symbol is
+            found in the fraction field of the metric tensor for 'rational' (see
+            objects.grtensors.rationalfield), and by the coordinate route otherwise. Defaults
+            to 'coordinate'
+        """
+        MetricTensor.__init__(self, metric_tensor, coord_sys, strategy=strategy)
+        self.cal_christoffelsymbol(engine)
+
+    def cal_christoffelsymbol(self, engine='coordinate'):
+        """
+        Calculating the christoffel symbol from the metric tensor of the object. With the
+        'rational' engine, a metric tensor whose components are rational functions (see
+        objects.grtensors.rationalfield) is taken to its fraction field, and the christoffel
+        symbol is found there without any simplification
+
+        Args:
+            engine [str]: The algorithm of the curvature tensors. Defaults to 'coordinate'
 
         Returns:
             self.chris_type [str]: Type of the christoffel symbol. Default type is 'udd'
+            self.rational_metric [RationalMetric]: The metric tensor in its fraction field, None
+            if the 'rational' engine is not used (or the metric tensor is not rational)
+            self.field_chris [dict]: The nonzero components of the christoffel symbol in the
+            fraction field (only for the rational metric tensors)
             self.chris_obj [sympy.tensor]: The christoffel symbol, Gamma^m_ij
+            self.chris_pattern [dict]: The structurally nonzero components of the christoffel
+            symbol (see christoffel_pattern), without the ones that pass the zero test (see
+            objects.zerotest). The other components are not computed
+            self.chris_derivatives [DerivativeTable]: The derivatives of the christoffel symbol
+            self.metric_second_derivatives [DerivativeTable]: The second derivatives of the
+            diagonal components of the metric tensor, d_i d_j g_mm (only for the diagonal metrics)
+            self.diagonal_chris_derivatives [dict]: The derivatives of the christoffel symbol that
+            are computed so far by diagonal_chris_derivative (only for the diagonal metrics)
         """
-        MetricTensor.__init__(self, metric_tensor, coord_sys)
         self.chris_type = 'udd'
-        chris_sym = MutableDenseNDimArray(zeros((self.ndim,)*3))
-        for m, i, j in product(range(self.ndim), repeat=3):
-            einstein_sum = 0
-            for k in range(self.ndim):
-                I1 = derivative_of_metric(
-                    self.coord_sys, self.metric_obj, j, k, i)
-                I2 = derivative_of_metric(
-                    self.coord_sys, self.metric_obj, i, k, j)
-                I3 = derivative_of_metric(
-                    self.coord_sys, self.metric_obj, k, i, j)
-                S = I1 + I2 - I3
-                einstein_sum += 1/2 * self.inverse_metric_obj[m, k] * S
-            chris_sym[m, i, j] = einstein_sum
+        self.rational_metric = rational_metric(self.metric_obj, self.coord_sys) if engine == 'rational' else None
+        dg = self.metric_derivatives
+        if self.rational_metric is not None:
+            self.field_chris = self.rational_metric.christoffel_symbol()
+            self.chris_pattern = {index: self.rational_metric.dependence(component)
+                                  for index, component in self.field_chris.items()}
+            chris_sym = self.rational_metric.to_tensor(self.field_chris, (self.ndim,)*3)
+        else:
+            self.chris_pattern = christoffel_pattern(self.metric_pattern, self.inverse_metric_pattern, self.ndim)
+            chris_sym = MutableDenseNDimArray.zeros(*(self.ndim,)*3)
+            for m, i, j in product(range(self.ndim), repeat=3):
+                if i > j:   # the christoffel symbol is symmetric in its lower indices
+                    chris_sym[m, i, j] = chris_sym[m, j, i]
+                    continue
+                if (m, i, j) not in self.chris_pattern:   # structurally zero
+                    continue
+                if self.metric_diagonal:
+                    chris_sym[m, i, j] = self.diagonal_chris_component(m, i, j)
+                    continue
+                einstein_sum = 0
+                for k in range(self.ndim):
+                    if (m, k) not in self.inverse_metric_pattern:
+                        continue
+                    I1 = dg[j, k, i]
+                    I2 = dg[i, k, j]
+                    I3 = dg[k, i, j]
+                    S = I1 + I2 - I3
+                    einstein_sum += Rational(1, 2) * self.inverse_metric_obj[m, k] * S
+                if zero_test(einstein_sum):   # the terms cancel out, so the component is dropped from the pattern
+                    del self.chris_pattern[m, i, j]
+                    self.chris_pattern.pop((m, j, i), None)
+                    continue
+                chris_sym[m, i, j] = einstein_sum
         self.chris_obj = chris_sym
+        self.chris_derivatives = DerivativeTable(self.chris_obj, self.coord_sys, symmetric=True,
+                                                 strategy=intermediate_strategy(self.strategy), pattern=self.chris_pattern)
+        if self.metric_diagonal:
+            diagonal_derivatives = Array([[dg[j, m, m] for m in range(self.ndim)] for j in range(self.ndim)])
+            self.metric_second_derivatives = DerivativeTable(
+                diagonal_derivatives, self.coord_sys, strategy=intermediate_strategy(self.strategy))
+            self.diagonal_chris_derivatives = {}
+
+    def diagonal_chris_component(self, m, i, j):
+        """
+        Calculating a component of the christoffel symbol of a diagonal metric by its closed form,
+        Gamma^m_mj = d_j g_mm / 2g_mm, Gamma^m_ii = -d_m g_ii / 2g_mm (m != i) and 0 otherwise
+
+        Args:
+            m,i,j [int]: Coordinate indices; (0-ndim)
+        """
+        dg = self.metric_derivatives
+        if m == i:
+            return Rational(1, 2) * self.inverse_metric_obj[m, m] * dg[j, m, m]
+        elif m == j:
+            return Rational(1, 2) * self.inverse_metric_obj[m, m] * dg[i, m, m]
+        elif i == j:
+            return -Rational(1, 2) * self.inverse_metric_obj[m, m] * dg[m, i, i]
+        return 0
+
+    def get_chris_derivative(self, n, m, i, j):
+        """
+        Returns the derivative of a component of the christoffel symbol, d_n Gamma^m_ij. It is
+        zero, without any differentiation, if the component does not depend on the n'th coordinate
+
+        Args:
+            n,m,i,j [int]: Coordinate indices; (0-ndim)
+        """
+        if n not in self.chris_pattern.get((m, i, j), ()):
+            return 0
+        if self.metric_diagonal:
+            return self.diagonal_chris_derivative(n, m, i, j)
+        return self.chris_derivatives[n, m, i, j]
+
+    def get_chris_pattern(self):
+        """
+        Returns the structurally nonzero components of the christoffel symbol
+        """
+        return self.chris_pattern
+
+    def diagonal_chris_derivative(self, n, m, i, j):
+        """
+        Calculating the derivative of a component of the christoffel symbol of a diagonal metric,
+        d_n Gamma^m_ij, by the closed form in terms of the first and the second derivatives of the
+        metric tensor, instead of differentiating the christoffel symbol itself
+
+        Args:
+            n,m,i,j [int]: Coordinate indices; (0-ndim)
+        """
+        if i > j:
+            i, j = j, i
+        if (n, m, i, j) in self.diagonal_chris_derivatives:
+            return self.diagonal_chris_derivatives[n, m, i, j]
+        dg = self.metric_derivatives
+        ddg = self.metric_second_derivatives
+        inverse_gmm = self.inverse_metric_obj[m, m]
+        if m == i or m == j:
+            p = j if m == i else i
+            chris_derivative = Rational(1, 2) * inverse_gmm * ddg[n, p, m] - Rational(1, 2) * inverse_gmm**2 * dg[n, m, m] * dg[p, m, m]
+        elif i == j:
+            chris_derivative = -Rational(1, 2) * inverse_gmm * ddg[n, m, i] + Rational(1, 2) * inverse_gmm**2 * dg[n, m, m] * dg[m, i, i]
+        else:
+            chris_derivative = 0
+        self.diagonal_chris_derivatives[n, m, i, j] = Simplify(chris_derivative, intermediate_strategy(self.strategy))
+        return self.diagonal_chris_derivatives[n, m, i, j]
 
     def get_christoffelsymbol(self):
         """
         Returns the christoffel symbol object
         """
-        return Simplify(self.chris_obj)
+        return Simplify(self.chris_obj, self.strategy)
 
     def get_christoffelsymbol_type(self):
         """
@@ -68,7 +211,7 @@ class ChristoffelSymbol(MetricTensor):
         Args:
             xchris_symbol [sympy.tensor]: Given christoffel symbol
         """
-        return Array(einsum('ijk,il->ljk', xchris_symbol, self.metric_obj, optimize='optimal'))
+        return self.contract_metric('ijk,il->ljk', xchris_symbol, self.metric_obj)
 
     def raise_index(self, xchris_symbol):
         """
@@ -77,7 +220,7 @@ class ChristoffelSymbol(MetricTensor):
         Args:
             xchris_symbol [sympy.tensor]: Given christoffel symbol
         """
-        return Array(einsum('ikj,jm->imk', xchris_symbol, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('ikj,jm->imk', xchris_symbol, self.inverse_metric_obj)
 
     def raise_index1(self, xchris_symbol):
         """
@@ -86,7 +229,7 @@ class ChristoffelSymbol(MetricTensor):
         Args:
             xchris_symbol [sympy.tensor]: Given christoffel symbol
         """
-        return Array(einsum('imk,kn->imn', xchris_symbol, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('imk,kn->imn', xchris_symbol, self.inverse_metric_obj)
 
     def vary_christoffelsymbol_type(self, xchris_symbol, new_type):
         """
@@ -101,11 +244,5 @@ class ChristoffelSymbol(MetricTensor):
             The new christoffel symbol for a given type
         """
         self.chris_type = new_type
-        if new_type == 'ddd':
-            return Simplify(self.lower_index(xchris_symbol))
-        elif new_type == 'udd':
-            return Simplify(self.chris_obj)
-        elif new_type == 'uud':
-            return Simplify(self.raise_index(xchris_symbol))
-        elif new_type == 'uuu':
-            return Simplify(self.raise_index1(self.raise_index(xchris_symbol)))
+        steps = {'ddd': ('udd', self.lower_index), 'uud': ('udd', self.raise_index), 'uuu': ('uud', self.raise_index1)}
+        return Simplify(self.get_index_variant('Christoffel Symbol', xchris_symbol, new_type, steps), self.strategy)
@@ -1,37 +1,47 @@
 from itertools import product
 
-from numpy import einsum, zeros
 from objects.grtensors.ricciscalar import RicciScalar
+from objects.packedtensor import SymmetricTensor
 from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray
+from sympy import Rational
 
 
 class EinsteinTensor(RicciScalar):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, strategy='full'):
         """
         Creating the einstein tensor object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+        """
+        RicciScalar.__init__(self, metric_tensor, coord_sys, strategy=strategy)
+        self.cal_einsteintensor()
+
+    def cal_einsteintensor(self):
+        """
+        Calculating the einstein tensor from the ricci tensor and ricci scalar of the object
 
         Returns:
             self.einsteintensor_type [str]: Type of the einstein tensor. Default type is 'dd'
-            self.einsteintensor_obj [sympy.tensor]: The einstein tensor, G_ij
+            self.einsteintensor_obj [SymmetricTensor]: The einstein tensor, G_ij
         """
-        RicciScalar.__init__(self, metric_tensor, coord_sys)
         self.einsteintensor_type = 'dd'
-        einstein_tensor = MutableDenseNDimArray(zeros((self.ndim,)*2))
+        einstein_tensor = SymmetricTensor(self.ndim)
         for i, k in product(range(self.ndim), repeat=2):
+            if i > k:   # stored once with its symmetric component (see objects.packedtensor)
+                continue
             einstein_tensor[i, k] = self.riccitensor_obj[i, k] - \
-                (1/2) * self.ricciscalar_obj * self.metric_obj[i, k]
+                Rational(1, 2) * self.ricciscalar_obj * self.metric_obj[i, k]
         self.einsteintensor_obj = einstein_tensor
 
     def get_einsteintensor(self):
         """
         Returns the einstein tensor object
         """
-        return Simplify(self.einsteintensor_obj)
+        return Simplify(self.einsteintensor_obj, self.strategy)
 
     def get_einsteintensor_type(self):
         """
@@ -46,7 +56,7 @@ class EinsteinTensor(RicciScalar):
         Args:
             xeinstein_tensor [sympy.tensor]: Given einstein tensor
         """
-        return Array(einsum('ij,jk->ki', xeinstein_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('ij,jk->ki', xeinstein_tensor, self.inverse_metric_obj)
 
     def vary_einsteintensor_type(self, xeinstein_tensor, new_type):
         """
@@ -61,9 +71,5 @@ class EinsteinTensor(RicciScalar):
             The new einstein tensor for a given type
         """
         self.einsteintensor_type = new_type
-        if new_type == 'dd':
-            return Simplify(self.einsteintensor_obj)
-        elif new_type == 'ud':
-            return Simplify(self.raise_index(xeinstein_tensor))
-        elif new_type == 'uu':
-            return Simplify(self.raise_index(self.raise_index(xeinstein_tensor)))
+        steps = {'ud': ('dd', self.raise_index), 'uu': ('ud', self.raise_index)}
+        return Simplify(self.get_index_variant('Einstein Tensor', xeinstein_tensor, new_type, steps), self.strategy)
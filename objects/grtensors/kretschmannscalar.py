@@ -1,35 +1,71 @@
 from itertools import product
 
+from objects.csetensor import CSETensor
 from objects.grtensors.riemanntensor import RiemannTensor
-from sympy import simplify
+from objects.simplifyobjects import Simplify, intermediate_strategy, simplify_components
 
 
 class KretschmannScalar(RiemannTensor):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, strategy='full'):
         """
         Creating the kretschmann scalar object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+        """
+        RiemannTensor.__init__(self, metric_tensor, coord_sys, strategy=strategy)
+        self.cal_kretschmannscalar()
+
+    def cal_kretschmannscalar(self):
+        """
+        Calculating the kretschmann scalar from the all-covariant riemann tensor of the object,
+        taken as a symmetric matrix on the pairs of its antisymmetric indices, R_AB with A = (a,b)
+        and a < b. Its indices are raised by the inverse metric tensor on the pairs,
+        g^AC = g^ae g^bf - g^af g^be, so that K = R_abcd R^abcd = 4 R_AB g^AC R_CD g^DB. Only the
+        components with A <= B are computed, the ones with A < B counted twice
 
         Returns:
             self.kretschmannscalar_obj [int/symbol]: The kretschmann scalar, K
         """
-        RiemannTensor.__init__(self, metric_tensor, coord_sys)
-        riemanntensor_13 = self.get_riemanntensor()
         riemanntensor_04 = self.vary_riemanntensor_type(
-            riemanntensor_13, 'dddd')
-        riemanntensor_40 = self.vary_riemanntensor_type(
-            riemanntensor_13, 'uuuu')
+            self.riemann_obj, 'dddd', intermediate_strategy(self.strategy))
+        pairs = [(a, b) for a, b in product(range(self.ndim), repeat=2) if a < b]
+        bivector = {}
+        for (A, (a, b)), (B, (c, d)) in product(enumerate(pairs), repeat=2):
+            if A <= B and riemanntensor_04[a, d, c, b] != 0:   # R_lijk with the pairs (l,k) and (j,i)
+                bivector[A, B] = bivector[B, A] = riemanntensor_04[a, d, c, b]
+        inverse_metric = self.inverse_metric_obj
+        pair_inverse = {}
+        for (A, (a, b)), (C, (e, f)) in product(enumerate(pairs), repeat=2):
+            component = inverse_metric[a, e] * inverse_metric[b, f] - inverse_metric[a, f] * inverse_metric[b, e]
+            if component != 0:
+                pair_inverse[A, C] = component
+        indices = [(A, B) for A, B in bivector if A <= B]
+        einstein_sums = []
+        for A, B in indices:
+            einstein_sum = 0
+            for (C, D), component in bivector.items():
+                if (A, C) in pair_inverse and (D, B) in pair_inverse:
+                    einstein_sum += pair_inverse[A, C] * component * pair_inverse[D, B]
+            einstein_sums.append(einstein_sum)
+        raised = simplify_components(einstein_sums, intermediate_strategy(self.strategy))
         kretschmann_scalar = 0
-        for a, b, c, d in product(range(self.ndim), repeat=4):
-            kretschmann_scalar += riemanntensor_04[a,
-                                                   b, c, d] * riemanntensor_40[a, b, c, d]
+        for (A, B), component in zip(indices, raised):
+            kretschmann_scalar += (4 if A == B else 8) * bivector[A, B] * component
         self.kretschmannscalar_obj = kretschmann_scalar
 
     def get_kretschmannscalar(self):
         """
         Returns the kretschmann scalar object
         """
-        return simplify(self.kretschmannscalar_obj)
+        return Simplify(self.kretschmannscalar_obj, self.strategy)
+
+    def get_kretschmannscalar_cse(self):
+        """
+        Returns the kretschmann scalar in the cse form, with a table of the subexpressions
+        that its terms share (see objects.csetensor)
+        """
+        return CSETensor(self.kretschmannscalar_obj, self.strategy)
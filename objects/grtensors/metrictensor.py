@@ -1,35 +1,179 @@
-from numpy import array, einsum
-from objects.simplifyobjects import Simplify
-from sympy import Array, Matrix
+from itertools import product
+
+from numpy import array
+from objects.contraction import contract, scale_index
+from objects.derivativetable import DerivativeTable, tensor_pattern
+from objects.simplifyobjects import Simplify, intermediate_strategy
+from sympy import Array, Matrix, MutableDenseNDimArray, cancel
+
+
+def metric_blocks(xmetric_tensor):
+    """
+    Splitting the coordinates into the blocks of the metric tensor, i.e., the groups of
+    coordinates that are coupled by its nonzero off-diagonal components. Each coordinate
+    of a diagonal metric is a block of its own
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+    """
+    ndim = xmetric_tensor.shape[0]
+    blocks = []
+    visited = set()
+    for i in range(ndim):
+        if i in visited:
+            continue
+        block, coupled = [], [i]
+        visited.add(i)
+        while coupled:
+            j = coupled.pop()
+            block.append(j)
+            for k in range(ndim):
+                if k not in visited and (xmetric_tensor[j, k] != 0 or xmetric_tensor[k, j] != 0):
+                    visited.add(k)
+                    coupled.append(k)
+        blocks.append(sorted(block))
+    return blocks
+
+
+def inverse_metric(xmetric_tensor, blocks):
+    """
+    Inverting the metric tensor block by block. The blocks of a single coordinate are
+    inverted by their reciprocals, the others by their fraction-free (bareiss) adjugate
+    and determinant
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+        blocks [list]: The blocks of the metric tensor
+    """
+    ndim = xmetric_tensor.shape[0]
+    inverse_metric_tensor = MutableDenseNDimArray.zeros(ndim, ndim)
+    for block in blocks:
+        if len(block) == 1:
+            i = block[0]
+            inverse_metric_tensor[i, i] = 1 / xmetric_tensor[i, i]
+            continue
+        xblock = Matrix([[xmetric_tensor[i, j] for j in block] for i in block])
+        determinant = xblock.det(method='bareiss')
+        adjugate = xblock.adjugate(method='bareiss')
+        for (a, i), (b, j) in product(enumerate(block), repeat=2):
+            inverse_metric_tensor[i, j] = cancel(adjugate[a, b] / determinant)
+    return Array(inverse_metric_tensor)
+
+
+def block_determinants(xmetric_tensor, blocks):
+    """
+    Finding the determinants of the blocks of the metric tensor, whose product is the
+    determinant of the metric tensor. The blocks of a single coordinate are their only
+    components, the others are found by the fraction-free (bareiss) method
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+        blocks [list]: The blocks of the metric tensor
+    """
+    determinants = []
+    for block in blocks:
+        if len(block) == 1:
+            determinants.append(xmetric_tensor[block[0], block[0]])
+            continue
+        xblock = Matrix([[xmetric_tensor[i, j] for j in block] for i in block])
+        determinants.append(cancel(xblock.det(method='bareiss')))
+    return determinants
 
 
 class MetricTensor(object):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, strategy='full'):
         """
         Creating the metric tensor object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Intermediate stages (derivatives, index raising, etc.) are only
+            simplified with the 'cheap' tier. Defaults to 'full'
 
         Returns:
             self.metric_obj [sympy.tensor]: The metric tensor, g_jk
             self.coord_sys [np.ndarray]: The coordinate system (cartesian, spherical, etc.)
             self.metric_type [str]: Type of the metric tensor. Default type is 'dd'
+            self.metric_blocks [list]: The blocks of the metric tensor (see metric_blocks)
             self.inverse_metric_obj [sympy.tensor]: The inverse of the metric tensor, g^jk
             self.ndim [int]: Dimension of the space. It can be 3 or 4
+            self.metric_diagonal [bool]: Whether the metric tensor is diagonal
+            self.metric_pattern [dict]: The nonzero components of the metric tensor (see tensor_pattern)
+            self.inverse_metric_pattern [dict]: The nonzero components of the inverse metric tensor
+            self.ignorable_coords [list]: The coordinates that no component of the metric tensor
+            depends on (e.g., t and phi of the schwarzschild metric)
+            self.metric_derivatives [DerivativeTable]: The derivatives of the metric tensor
+            self.strategy [str]: The simplification tier of the results
+            self.index_variants [dict]: The types of the tensors that are computed so far (see
+            get_index_variant). It is shared with the objects that are built on top of this
+            object (see spacetime.extend_grtensor)
         """
         self.metric_obj = Array(metric_tensor)
         self.coord_sys = array(coord_sys)
         self.metric_type = 'dd'
-        self.inverse_metric_obj = Array(Matrix(metric_tensor).inv())
+        self.metric_blocks = metric_blocks(self.metric_obj)
+        self.inverse_metric_obj = inverse_metric(self.metric_obj, self.metric_blocks)
         self.ndim = len(coord_sys)
+        self.metric_diagonal = len(self.metric_blocks) == self.ndim
+        self.metric_pattern = tensor_pattern(self.metric_obj, self.coord_sys)
+        self.inverse_metric_pattern = tensor_pattern(self.inverse_metric_obj, self.coord_sys)
+        dependence = frozenset().union(*self.metric_pattern.values())
+        self.ignorable_coords = [coord for a, coord in enumerate(coord_sys) if a not in dependence]
+        self.strategy = strategy
+        self.metric_derivatives = DerivativeTable(self.metric_obj, self.coord_sys, symmetric=True,
+                                                  strategy=intermediate_strategy(strategy), pattern=self.metric_pattern)
+        self.index_variants = {}
+
+    def get_index_variant(self, tensor_object, xtensor, new_type, steps):
+        """
+        Returns a tensor of the object in a given type. Each type is found by a single contraction
+        (one raised or lowered index) from the type before it, which is taken from the cache of
+        the index variants, so that every type of a tensor is computed at most once. The types are
+        cached as they are found, with the tensor that they are found from, and they are
+        simplified by the callers
+
+        Args:
+            tensor_object [str/tuple]: The name of the grtensor object (metric tensor, riemann
+            tensor, etc.), with the simplification tier if the steps simplify the types
+            xtensor [sympy.tensor]: The tensor in its default type (e.g., the simplified one),
+            which the types are found from on their first access
+            new_type [str]: The type of the tensor
+            steps [dict]: The type that each type is found from, with the method that finds it
+            (e.g., 'uudd': ('uddd', self.raise_index1)). The default type has no step
+        """
+        if new_type not in steps:   # the default type
+            return xtensor
+        if isinstance(xtensor, (list, MutableDenseNDimArray)):   # hashable, so that it is a part of the key
+            xtensor = Array(xtensor)
+        key = (tensor_object, new_type, xtensor)
+        if key not in self.index_variants:
+            previous_type, step = steps[new_type]
+            previous_tensor = self.get_index_variant(tensor_object, xtensor, previous_type, steps)
+            self.index_variants[key] = step(previous_tensor)
+        return self.index_variants[key]
+
+    def contract_metric(self, subscripts, xtensor, xmetric_tensor):
+        """
+        Contracting an index of a tensor with the metric tensor or its inverse, i.e. lowering or
+        raising the index (see objects.contraction). The index of a diagonal metric tensor is
+        only scaled by g_ii (or g^ii), component by component
+
+        Args:
+            subscripts [str]: The index letters of the tensor, of the metric tensor and of the result
+            xtensor [sympy.tensor]: Given tensor
+            xmetric_tensor [sympy.tensor]: The metric tensor or its inverse
+        """
+        if self.metric_diagonal:
+            return scale_index(subscripts, xtensor, [xmetric_tensor[i, i] for i in range(self.ndim)])
+        return contract(subscripts, xtensor, xmetric_tensor)
 
     def get_metrictensor(self):
         """
         Returns the metric tensor object
         """
-        return Simplify(self.metric_obj)
+        return Simplify(self.metric_obj, self.strategy)
 
     def get_metrictensor_type(self):
         """
@@ -41,7 +185,7 @@ class MetricTensor(object):
         """
         Returns the inverse of the metric tensor
         """
-        return Simplify(self.inverse_metric_obj)
+        return Simplify(self.inverse_metric_obj, self.strategy)
 
     def raise_index(self, xmetric_tensor):
         """
@@ -50,7 +194,7 @@ class MetricTensor(object):
         Args:
             xmetric_tensor [sympy.tensor]: Given metric tensor
         """
-        return Array(einsum('jk,ki->ji', xmetric_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('jk,ki->ji', xmetric_tensor, self.inverse_metric_obj)
 
     def vary_metrictensor_type(self, xmetric_tensor, new_type):
         """
@@ -65,9 +209,5 @@ class MetricTensor(object):
             The new metric tensor for a given type
         """
         self.metric_type = new_type
-        if new_type == 'dd':
-            return Simplify(self.metric_obj)
-        elif new_type == 'ud':
-            return Simplify(self.raise_index(xmetric_tensor))
-        elif new_type == 'uu':
-            return Simplify(self.raise_index(self.raise_index(xmetric_tensor)))
+        steps = {'ud': ('dd', self.raise_index), 'uu': ('ud', self.raise_index)}
+        return Simplify(self.get_index_variant('Metric Tensor', xmetric_tensor, new_type, steps), self.strategy)
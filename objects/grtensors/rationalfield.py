@@ -0,0 +1,276 @@
+# Creating the curvature of a metric whose components are rational functions of the coordinates
+# (and of their sines and cosines) in the fraction field of its components (sympy.polys), as an
+# alternative to the generic expressions of the coordinate route. Every component is kept in the
+# canonical form of the field, p/q with gcd(p, q) = 1, so that no simplification is needed, and
+# the components are turned into expressions only for the results
+
+from itertools import product
+
+from objects.contraction import dense_tensor
+from sympy import QQ, Dummy, Float, Symbol, cos, sin
+from sympy.polys.matrices import DomainMatrix
+
+
+class RationalMetric(object):
+    def __init__(self, xmetric_tensor, coord_sys):
+        """
+        Creating the metric tensor in the fraction field of its components. The generators of the
+        field are the coordinates, the other symbols of the metric tensor (e.g., r_s) and the
+        cosine and the sine of each coordinate that they appear with, c_x and s_x. The numerators
+        and the denominators are reduced by c_x**2 + s_x**2 = 1, so that a component that is zero
+        is always found as zero
+
+        Args:
+            xmetric_tensor [sympy.tensor]: Given metric tensor
+            coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+
+        Returns:
+            self.ndim [int]: Dimension of the space
+            self.field [FracField]: The fraction field of the components
+            self.coords [list]: The coordinates, as generators of the field
+            self.trig_gens [dict]: The cosine and the sine generators of each coordinate (by its index)
+            self.relations [list]: The numerators c_x**2 + s_x**2 - 1, which the components are reduced by
+            self.gen_exprs [list]: The expressions of the generators (e.g., sin(theta) for s_theta)
+            self.metric [dict]: The nonzero components of the metric tensor, in the field
+            self.inverse [dict]: The nonzero components of the inverse metric tensor, in the field
+            self.chris_derivatives [dict]: The derivatives of the christoffel symbol that are computed
+            so far (see chris_derivative)
+
+        Raises:
+            ValueError: If a component is not a rational function of the generators (e.g., it has
+            an unknown function, a root or a floating-point number)
+        """
+        self.ndim = len(coord_sys)
+        components = [xmetric_tensor[i, j] for i, j in product(range(self.ndim), repeat=2)]
+        if any(component.has(Float) for component in components):
+            raise ValueError('The metric tensor has floating-point numbers')
+        trig_coords = sorted({a for component in components for atom in component.atoms(sin, cos)
+                              for a, coord in enumerate(coord_sys) if atom.args[0] == coord})
+        parameters = sorted(set().union(*(component.free_symbols for component in components)) - set(coord_sys), key=str)
+        trig_dummies = {a: (Dummy('c_' + str(coord_sys[a])), Dummy('s_' + str(coord_sys[a]))) for a in trig_coords}
+        generators = list(coord_sys) + parameters + [dummy for a in trig_coords for dummy in trig_dummies[a]]
+        self.gen_exprs = list(coord_sys) + parameters + [trig(coord_sys[a]) for a in trig_coords for trig in (cos, sin)]
+        self.trig_replacements = {trig(coord_sys[a]): dummy for a in trig_coords for trig, dummy in zip((cos, sin), trig_dummies[a])}
+        self.domain = QQ.frac_field(*generators)
+        self.field = self.domain.field
+        field_gens = self.field.gens
+        self.coords = list(field_gens[:self.ndim])
+        self.trig_gens = {a: (field_gens[generators.index(c)], field_gens[generators.index(s)])
+                          for a, (c, s) in trig_dummies.items()}
+        self.relations = [(c**2 + s**2 - 1).numer for c, s in self.trig_gens.values()]
+        self.metric = {}
+        for (i, j), component in zip(product(range(self.ndim), repeat=2), components):
+            if component != 0:
+                self.metric[i, j] = self.to_field(component)
+        inverse = DomainMatrix([[self.metric.get((i, j), self.field.zero) for j in range(self.ndim)]
+                                for i in range(self.ndim)], (self.ndim, self.ndim), self.domain).inv()
+        self.inverse = {}
+        for i, j in product(range(self.ndim), repeat=2):
+            component = self.normal(inverse[i, j].element)
+            if component:
+                self.inverse[i, j] = component
+        self.chris_derivatives = {}
+
+    def to_field(self, expr):
+        """
+        Converting an expression to the field
+
+        Args:
+            expr [sympy.symbol]: Given expression
+        """
+        return self.normal(self.field.from_expr(expr.xreplace(self.trig_replacements)))
+
+    def to_expr(self, element):
+        """
+        Converting an element of the field back to an expression
+
+        Args:
+            element [FracElement]: Given element of the field
+        """
+        return element.as_expr(*self.gen_exprs)
+
+    def to_tensor(self, components, shape):
+        """
+        Building the tensor of the expressions of given components
+
+        Args:
+            components [dict]: The nonzero components of the tensor, in the field
+            shape [tuple]: The shape of the tensor
+        """
+        return dense_tensor({index: self.to_expr(component) for index, component in components.items()}, shape)
+
+    def normal(self, element):
+        """
+        Reducing the numerator and the denominator of an element of the field by the relations
+        of the sines and the cosines, c_x**2 + s_x**2 = 1
+
+        Args:
+            element [FracElement]: Given element of the field
+        """
+        if not self.relations:
+            return element
+        return self.field.new(element.numer.rem(self.relations), element.denom.rem(self.relations))
+
+    def derivative(self, element, a):
+        """
+        Differentiating an element of the field with respect to the a'th coordinate, by the chain
+        rule through the cosine and the sine of the coordinate, d_x c_x = -s_x and d_x s_x = c_x
+
+        Args:
+            element [FracElement]: Given element of the field
+            a [int]: The index of the coordinate
+        """
+        derivative = element.diff(self.coords[a])
+        if a in self.trig_gens:
+            c, s = self.trig_gens[a]
+            derivative += c * element.diff(s) - s * element.diff(c)
+        return self.normal(derivative)
+
+    def dependence(self, element):
+        """
+        Finding the coordinates that an element of the field depends on
+
+        Args:
+            element [FracElement]: Given element of the field
+
+        Returns:
+            [frozenset]: The indices of the coordinates
+        """
+        dependence = set()
+        for a in range(self.ndim):
+            gens = (self.coords[a],) + self.trig_gens.get(a, ())
+            if any(poly.degree(gen.numer) > 0 for poly in (element.numer, element.denom) for gen in gens):
+                dependence.add(a)
+        return frozenset(dependence)
+
+    def christoffel_symbol(self):
+        """
+        Calculating the christoffel symbol, Gamma^m_ij = g^mk (d_j g_ki + d_i g_kj - d_k g_ij)/2
+
+        Returns:
+            [dict]: The nonzero components of the christoffel symbol, in the field
+        """
+        dg = {}
+        for (i, j), component in self.metric.items():
+            for a in range(self.ndim):
+                derivative = self.derivative(component, a)
+                if derivative:
+                    dg[a, i, j] = derivative
+        zero = self.field.zero
+        chris = {}
+        for m, i, j in product(range(self.ndim), repeat=3):
+            if i > j:   # the christoffel symbol is symmetric in its lower indices
+                if (m, j, i) in chris:
+                    chris[m, i, j] = chris[m, j, i]
+                continue
+            einstein_sum = zero
+            for (n, k), inverse in self.inverse.items():
+                if n == m:
+                    einstein_sum += inverse * (dg.get((j, k, i), zero) + dg.get((i, k, j), zero) - dg.get((k, i, j), zero))
+            einstein_sum = self.normal(einstein_sum / 2)
+            if einstein_sum:
+                chris[m, i, j] = einstein_sum
+        return chris
+
+    def chris_derivative(self, chris, n, index):
+        """
+        Returns the derivative of a component of the christoffel symbol, d_n Gamma^m_ij
+
+        Args:
+            chris [dict]: The christoffel symbol (see christoffel_symbol)
+            n [int]: The index of the coordinate
+            index [tuple]: The indices of the component
+        """
+        if index not in chris:
+            return self.field.zero
+        m, i, j = index
+        key = (n, m, min(i, j), max(i, j))
+        if key not in self.chris_derivatives:
+            self.chris_derivatives[key] = self.derivative(chris[index], n)
+        return self.chris_derivatives[key]
+
+    def riemann_tensor(self, chris):
+        """
+        Calculating the riemann tensor in the index convention of RiemannTensor,
+        R^l_ijk = d_j Gamma^l_ik - d_i Gamma^l_jk + Gamma^p_ik Gamma^l_jp - Gamma^p_jk Gamma^l_ip.
+        The components are exact, so only the ones with i < j are computed and the rest are
+        filled by antisymmetry
+
+        Args:
+            chris [dict]: The christoffel symbol (see christoffel_symbol)
+
+        Returns:
+            [dict]: The nonzero components of the riemann tensor, in the field
+        """
+        zero = self.field.zero
+        riemann = {}
+        for l, i, j, k in product(range(self.ndim), repeat=4):
+            if i >= j:
+                continue
+            einstein_sum = self.chris_derivative(chris, j, (l, i, k)) - self.chris_derivative(chris, i, (l, j, k))
+            for p in range(self.ndim):
+                einstein_sum += chris.get((p, i, k), zero) * chris.get((l, j, p), zero) - \
+                    chris.get((p, j, k), zero) * chris.get((l, i, p), zero)
+            einstein_sum = self.normal(einstein_sum)
+            if einstein_sum:
+                riemann[l, i, j, k] = einstein_sum
+                riemann[l, j, i, k] = -einstein_sum
+        return riemann
+
+    def ricci_tensor(self, chris):
+        """
+        Calculating the ricci tensor as the contraction of the riemann tensor, R_ik = R^j_ijk,
+        without the riemann tensor itself. The ricci tensor is symmetric, so only the components
+        with i <= k are computed
+
+        Args:
+            chris [dict]: The christoffel symbol (see christoffel_symbol)
+
+        Returns:
+            [dict]: The nonzero components of the ricci tensor with i <= k, in the field
+        """
+        zero = self.field.zero
+        ricci = {}
+        for i, k in product(range(self.ndim), repeat=2):
+            if i > k:
+                continue
+            einstein_sum = zero
+            for j in range(self.ndim):
+                einstein_sum += self.chris_derivative(chris, j, (j, i, k)) - self.chris_derivative(chris, i, (j, j, k))
+                for p in range(self.ndim):
+                    einstein_sum += chris.get((p, i, k), zero) * chris.get((j, j, p), zero) - \
+                        chris.get((p, j, k), zero) * chris.get((j, i, p), zero)
+            einstein_sum = self.normal(einstein_sum)
+            if einstein_sum:
+                ricci[i, k] = einstein_sum
+        return ricci
+
+    def trace(self, xtensor):
+        """
+        Contracting a symmetric rank-2 tensor with the inverse metric tensor, g^ik T_ik
+
+        Args:
+            xtensor [dict]: The nonzero components of the tensor with i <= k, in the field
+        """
+        einstein_sum = self.field.zero
+        for (i, k), inverse in self.inverse.items():
+            einstein_sum += inverse * xtensor.get((min(i, k), max(i, k)), self.field.zero)
+        return self.normal(einstein_sum)
+
+
+def rational_metric(xmetric_tensor, coord_sys):
+    """
+    Returns the metric tensor in the fraction field of its components (see RationalMetric), or
+    None if it is not a rational function of the coordinates, their sines and cosines and the
+    other symbols of the metric tensor
+
+    Args:
+        xmetric_tensor [sympy.tensor]: Given metric tensor
+        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+    """
+    if not all(isinstance(coord, Symbol) for coord in coord_sys):
+        return None
+    try:
+        return RationalMetric(xmetric_tensor, coord_sys)
+    except ValueError:
+        return None
@@ -1,22 +1,34 @@
 from itertools import product
 
 from objects.grtensors.riccitensor import RicciTensor
-from sympy import simplify
+from objects.simplifyobjects import Simplify
 
 
 class RicciScalar(RicciTensor):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, strategy='full'):
         """
         Creating the ricci scalar object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+        """
+        RicciTensor.__init__(self, metric_tensor, coord_sys, strategy=strategy)
+        self.cal_ricciscalar()
+
+    def cal_ricciscalar(self):
+        """
+        Calculating the ricci scalar from the ricci tensor of the object, in the fraction field
+        of the metric tensor if the ricci tensor is found there
 
         Returns:
             self.ricciscalar_obj [int/symbol]: The ricci scalar, R
         """
-        RicciTensor.__init__(self, metric_tensor, coord_sys)
+        if self.rational_metric is not None:
+            self.ricciscalar_obj = self.rational_metric.to_expr(self.rational_metric.trace(self.field_ricci))
+            return
         ricci_scalar = 0
         for i, k in product(range(self.ndim), repeat=2):
             ricci_scalar += self.inverse_metric_obj[i,
@@ -27,4 +39,4 @@ class RicciScalar(RicciTensor):
         """
         Returns the ricci scalar object
         """
-        return simplify(self.ricciscalar_obj)
+        return Simplify(self.ricciscalar_obj, self.strategy)
@@ -1,39 +1,94 @@
 from itertools import product
 
-from numpy import einsum, zeros
-from objects.grtensors.riemanntensor import RiemannTensor
-from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray
+from objects.derivativetable import DerivativeTable
+from objects.grtensors.christoffelsymbol import ChristoffelSymbol
+from objects.grtensors.metrictensor import block_determinants
+from objects.packedtensor import SymmetricTensor
+from objects.simplifyobjects import Diff, Simplify, intermediate_strategy
+from objects.zerotest import zero_test
+from sympy import Array, Rational
 
 
-class RicciTensor(RiemannTensor):
-    def __init__(self, metric_tensor, coord_sys):
+class RicciTensor(ChristoffelSymbol):
+    def __init__(self, metric_tensor, coord_sys, strategy='full', engine='coordinate'):
         """
         Creating the ricci tensor object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+            engine [str]: The algorithm of the curvature tensors. The ricci tensor of a rational
+            metric tensor is found in its fraction field for 'rational' (see
+            objects.grtensors.rationalfield). Defaults to 'coordinate'
+        """
+        ChristoffelSymbol.__init__(self, metric_tensor, coord_sys, strategy=strategy, engine=engine)
+        self.cal_riccitensor()
+
+    def cal_riccitensor(self):
+        """
+        Calculating the ricci tensor directly from the christoffel symbol of the object, without
+        the riemann tensor, by its contracted form,
+        R_ik = d_j Gamma^j_ik - d_i d_k ln sqrt|g| + Gamma^p_ik d_p ln sqrt|g| - Gamma^p_jk Gamma^j_ip,
+        in which the trace of the christoffel symbol, Gamma^j_jk = d_k ln sqrt|g|, is found from
+        the determinants of the blocks of the metric tensor. The ricci tensor is symmetric, so
+        only the components with i <= k are computed, and the ones that pass the zero test (see
+        objects.zerotest) are dropped. The christoffel symbol of a rational metric tensor gives
+        the ricci tensor in the fraction field instead (see objects.grtensors.rationalfield)
 
         Returns:
             self.riccitensor_type [str]: Type of the ricci tensor. Default type is 'dd'
-            self.riccitensor_obj [sympy.tensor]: The ricci tensor, R_ik
+            self.riccitensor_obj [SymmetricTensor]: The ricci tensor, R_ik
+            self.volume_derivatives [sympy.tensor]: The derivatives of the logarithm of the
+            volume element, d_k ln sqrt|g| (only for the coordinate route)
+            self.field_ricci [dict]: The nonzero components of the ricci tensor in the fraction
+            field, with i <= k (only for the rational metric tensors)
         """
-        RiemannTensor.__init__(self, metric_tensor, coord_sys)
         self.riccitensor_type = 'dd'
-        ricci_tensor = MutableDenseNDimArray(zeros((self.ndim,)*2))
-        for i, k in product(range(self.ndim), repeat=2):
+        if self.rational_metric is not None:   # exact, so it is not simplified
+            self.field_ricci = self.rational_metric.ricci_tensor(self.field_chris)
+            self.riccitensor_obj = SymmetricTensor(self.ndim)
+            for index, component in self.field_ricci.items():
+                self.riccitensor_obj[index] = self.rational_metric.to_expr(component)
+            return
+        determinants = block_determinants(self.metric_obj, self.metric_blocks)
+        volume_derivatives = []
+        for k in range(self.ndim):
             einstein_sum = 0
+            for block, determinant in zip(self.metric_blocks, determinants):
+                if len(block) == 1:
+                    derivative = self.metric_derivatives[k, block[0], block[0]]
+                else:
+                    derivative = Diff(determinant, self.coord_sys[k])
+                if derivative != 0:
+                    einstein_sum += Rational(1, 2) * derivative / determinant
+            volume_derivatives.append(einstein_sum)
+        self.volume_derivatives = Simplify(Array(volume_derivatives), intermediate_strategy(self.strategy))
+        dv = DerivativeTable(self.volume_derivatives, self.coord_sys, strategy=intermediate_strategy(self.strategy))
+        chris = self.chris_obj
+        ricci_tensor = SymmetricTensor(self.ndim)
+        for i, k in product(range(self.ndim), repeat=2):
+            if i > k:   # stored once with its symmetric component (see objects.packedtensor)
+                continue
+            einstein_sum = -dv[i, k]
             for j in range(self.ndim):
-                einstein_sum += self.riemann_obj[j, i, j, k]
+                einstein_sum += self.get_chris_derivative(j, j, i, k)
+                if (j, i, k) in self.chris_pattern:
+                    einstein_sum += chris[j, i, k] * self.volume_derivatives[j]
+                for p in range(self.ndim):
+                    if (p, j, k) in self.chris_pattern and (j, i, p) in self.chris_pattern:
+                        einstein_sum -= chris[p, j, k] * chris[j, i, p]
+            if zero_test(einstein_sum):   # the terms cancel out (see objects.zerotest)
+                continue
             ricci_tensor[i, k] = einstein_sum
-        self.riccitensor_obj = ricci_tensor
+        self.riccitensor_obj = Simplify(ricci_tensor, intermediate_strategy(self.strategy))
 
     def get_riccitensor(self):
         """
         Returns the ricci tensor object
         """
-        return Simplify(self.riccitensor_obj)
+        return Simplify(self.riccitensor_obj, self.strategy)
 
     def get_riccitensor_type(self):
         """
@@ -48,7 +103,7 @@ class RicciTensor(RiemannTensor):
         Args:
             xricci_tensor [sympy.tensor]: Given ricci tensor
         """
-        return Array(einsum('ij,jk->ik', xricci_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('ij,jk->ik', xricci_tensor, self.inverse_metric_obj)
 
     def vary_riccitensor_type(self, xricci_tensor, new_type):
         """
@@ -63,9 +118,5 @@ class RicciTensor(RiemannTensor):
             The new ricci tensor for a given type
         """
         self.riccitensor_type = new_type
-        if new_type == 'dd':
-            return Simplify(self.riccitensor_obj)
-        elif new_type == 'ud':
-            return Simplify(self.raise_index(xricci_tensor))
-        elif new_type == 'uu':
-            return Simplify(self.raise_index(self.raise_index(xricci_tensor)))
+        steps = {'ud': ('dd', self.raise_index), 'uu': ('ud', self.raise_index)}
+        return Simplify(self.get_index_variant('Ricci Tensor', xricci_tensor, new_type, steps), self.strategy)
@@ -1,58 +1,286 @@
 from itertools import product
 
-from numpy import einsum, zeros
+from objects.csetensor import CSETensor
+from objects.derivativetable import DerivativeTable, tensor_pattern
+from objects.grtensors.cartan import cartan_riemann
 from objects.grtensors.christoffelsymbol import ChristoffelSymbol
-from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray, diff
+from objects.packedtensor import RiemannSymmetricTensor, negative_component, riemann_canonical_index
+from objects.simplifyobjects import Simplify, intermediate_strategy, simplify_components
+from objects.zerotest import zero_test
+from sympy import MutableDenseNDimArray, Rational
 
 
-def derivative_of_chris(coord_sys, chris_symb, i, j, k, l):
+def riemann_independent_components(ndim):
     """
-    Taking the partial derivative of a given christoffel symbol [Gamma^j_kl] with respect to the
-    [i]'th component
+    The canonical components of the all-covariant riemann tensor [R_lijk] that are
+    algebraically independent, i.e. n^2(n^2-1)/12 of them in n dimensions
 
     Args:
-        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
-        chris_symb [sympy.tensor]: Given christoffel symbol, Gamma^j_kl
-        i,j,k,l [int]: Coordinate indices; (0-ndim)
+        ndim [int]: Dimension of the space
+
+    Returns:
+        [list]: The indices of the independent components
+    """
+    bianchi_components = riemann_bianchi_components(ndim)
+    components = []
+    for l, i, j, k in product(range(ndim), repeat=4):
+        sign, index = riemann_canonical_index(l, i, j, k)
+        if sign == 1 and index == (l, i, j, k) and index not in bianchi_components:
+            components.append(index)
+    return components
+
+
+def riemann_bianchi_components(ndim):
     """
-    return Simplify(diff(chris_symb[j, k, l], coord_sys[i]))
+    The canonical components of the all-covariant riemann tensor [R_lijk] that are fixed by
+    the first bianchi identity. For a < b < c < d, the identity gives the component with the
+    pairs (a,d),(b,c) as the difference of the ones with the pairs (a,c),(b,d) and (a,b),(c,d)
+
+    Args:
+        ndim [int]: Dimension of the space
+
+    Returns:
+        [dict]: The indices of the dependent components, with the two independent
+        components (index1, index2) that they are equal to, R_index1 - R_index2
+    """
+    components = {}
+    for a, b, c, d in product(range(ndim), repeat=4):
+        if a < b < c < d:
+            components[a, c, b, d] = ((a, d, b, c), (a, d, c, b))
+    return components
+
+
+def riemann_pattern(chris_pattern, ndim):
+    """
+    Finding the structurally nonzero components of the riemann tensor, R^l_ijk, and the
+    coordinates that they depend on, from the ones of the christoffel symbol. A term of the
+    riemann tensor is nonzero only if its christoffel symbols are nonzero and the differentiated
+    christoffel symbol depends on the coordinate of the derivative
+
+    Args:
+        chris_pattern [dict]: The nonzero components of the christoffel symbol
+        ndim [int]: Dimension of the space
+
+    Returns:
+        [dict]: The indices of the nonzero components, with the set of the indices of the
+        coordinates that they depend on
+    """
+    pattern = {}
+    for l, i, j, k in product(range(ndim), repeat=4):
+        if i >= j:   # R^l_ijk is antisymmetric in i and j
+            if (l, j, i, k) in pattern:
+                pattern[l, i, j, k] = pattern[l, j, i, k]
+            continue
+        dependence = None
+        for index, a in (((l, i, k), j), ((l, j, k), i)):
+            if a in chris_pattern.get(index, ()):
+                dependence = (dependence or frozenset()) | chris_pattern[index]
+        for p in range(ndim):
+            for index1, index2 in (((p, i, k), (l, j, p)), ((p, j, k), (l, i, p))):
+                if index1 in chris_pattern and index2 in chris_pattern:
+                    dependence = (dependence or frozenset()) | chris_pattern[index1] | chris_pattern[index2]
+        if dependence is not None:
+            pattern[l, i, j, k] = dependence
+    return pattern
+
+
+def fill_riemann_tensor(components, ndim):
+    """
+    Filling the all-covariant riemann tensor [R_lijk] from its canonical components. Only the
+    canonical components are stored, and the rest are found by symmetry on access (see
+    objects.packedtensor)
+
+    Args:
+        components [dict]: The independent and the bianchi components of the riemann tensor
+        ndim [int]: Dimension of the space
+    """
+    return RiemannSymmetricTensor(ndim, [components[index] for index in RiemannSymmetricTensor.canonical_positions(ndim)])
 
 
 class RiemannTensor(ChristoffelSymbol):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, independent=True, strategy='full', engine='coordinate', coframe=None):
         """
         Creating the riemann tensor object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            independent [bool]: Computing only the algebraically independent components of
+            the riemann tensor and filling the rest by its symmetries. Defaults to True
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+            engine [str]: The algorithm of the riemann tensor; 'coordinate' (from the christoffel
+            symbol), 'covariant' (the all-covariant riemann tensor from the second derivatives of
+            the metric tensor) or 'cartan' (by the structure equations of cartan, see
+            objects.grtensors.cartan) or 'rational' (in the fraction field of a metric tensor whose
+            components are rational functions, see objects.grtensors.rationalfield; the other
+            metrics take the coordinate route). Defaults to 'coordinate'
+            coframe [list]: The orthonormal coframe of the 'cartan' engine, E[a][mu]. Built from
+            the metric tensor if it is not given
+        """
+        ChristoffelSymbol.__init__(self, metric_tensor, coord_sys, strategy=strategy, engine=engine)
+        self.cal_riemanntensor(independent, engine, coframe)
+
+    def cal_riemanntensor(self, independent=True, engine='coordinate', coframe=None):
+        """
+        Calculating the riemann tensor from the christoffel symbol of the object, from the
+        all-covariant riemann tensor (see cal_covariant_riemanntensor), by the structure
+        equations of cartan or in the fraction field of the metric tensor
+
+        Args:
+            independent [bool]: Computing only the algebraically independent components of
+            the riemann tensor and filling the rest by its symmetries. Defaults to True
+            engine [str]: The algorithm of the riemann tensor; 'coordinate', 'covariant',
+            'cartan' or 'rational'. Defaults to 'coordinate'
+            coframe [list]: The orthonormal coframe of the 'cartan' engine. Built from the
+            metric tensor if it is not given
 
         Returns:
             self.riemann_type [str]: Type of the riemann tensor. Default type is 'uddd'
             self.riemann_obj [sympy.tensor]: The riemann tensor, R^l_ijk
+            self.riemann_independent [bool]: Whether the independent components mode is used
+            self.riemann_engine [str]: The algorithm of the riemann tensor
+            self.riemann_covariant_obj [sympy.tensor]: The all-covariant riemann tensor, R_lijk
+            (only for the 'covariant' engine)
+            self.riemann_pattern [dict]: The structurally nonzero components of the riemann
+            tensor (see riemann_pattern), without the ones that pass the zero test (see
+            objects.zerotest). The other components are not computed
         """
-        ChristoffelSymbol.__init__(self, metric_tensor, coord_sys)
+        if engine not in ('coordinate', 'covariant', 'cartan', 'rational'):
+            raise ValueError('Unknown curvature engine: {0}'.format(engine))
         self.riemann_type = 'uddd'
-        riemann_tensor = MutableDenseNDimArray(zeros((self.ndim,)*4))
+        self.riemann_independent = independent
+        self.riemann_engine = engine
+        if engine == 'covariant':
+            self.riemann_covariant_obj = self.cal_covariant_riemanntensor(intermediate_strategy(self.strategy))
+            riemann_tensor = MutableDenseNDimArray.zeros(*(self.ndim,)*4)
+            for l, i, j, k in product(range(self.ndim), repeat=4):
+                if i >= j:   # R^l_ijk is antisymmetric in i and j
+                    riemann_tensor[l, i, j, k] = -riemann_tensor[l, j, i, k] if i > j else 0
+                    continue
+                einstein_sum = 0
+                for m in range(self.ndim):
+                    if (l, m) in self.inverse_metric_pattern:
+                        einstein_sum += self.inverse_metric_obj[l, m] * self.riemann_covariant_obj[m, i, j, k]
+                riemann_tensor[l, i, j, k] = einstein_sum
+            self.riemann_obj = Simplify(riemann_tensor, intermediate_strategy(self.strategy))
+            self.riemann_pattern = tensor_pattern(self.riemann_obj, self.coord_sys)
+            return
+        if engine == 'cartan':
+            self.riemann_obj = cartan_riemann(self.metric_obj, self.coord_sys, coframe,
+                                              intermediate_strategy(self.strategy), independent)
+            self.riemann_pattern = tensor_pattern(self.riemann_obj, self.coord_sys)
+            return
+        if engine == 'rational' and self.rational_metric is not None:   # exact, so it is not simplified
+            components = self.rational_metric.riemann_tensor(self.field_chris)
+            self.riemann_pattern = {index: self.rational_metric.dependence(component)
+                                    for index, component in components.items()}
+            self.riemann_obj = self.rational_metric.to_tensor(components, (self.ndim,)*4)
+            return
+        self.riemann_pattern = riemann_pattern(self.chris_pattern, self.ndim)
+        riemann_tensor = MutableDenseNDimArray.zeros(*(self.ndim,)*4)
         for l, i, j, k in product(range(self.ndim), repeat=4):
-            Q1 = derivative_of_chris(
-                self.coord_sys, self.chris_obj, j, l, i, k)
-            Q2 = derivative_of_chris(
-                self.coord_sys, self.chris_obj, i, l, j, k)
+            if independent and i >= j:   # R^l_ijk is antisymmetric in i and j
+                riemann_tensor[l, i, j, k] = -riemann_tensor[l, j, i, k] if i > j else 0
+                continue
+            if (l, i, j, k) not in self.riemann_pattern:   # structurally zero
+                continue
+            Q1 = self.get_chris_derivative(j, l, i, k)
+            Q2 = self.get_chris_derivative(i, l, j, k)
             einstein_sum = 0
             for p in range(self.ndim):
-                I1 = self.chris_obj[p, i, k] * self.chris_obj[l, j, p]
-                I2 = self.chris_obj[p, j, k] * self.chris_obj[l, i, p]
-                einstein_sum += (I1 - I2)
+                if (p, i, k) in self.chris_pattern and (l, j, p) in self.chris_pattern:
+                    einstein_sum += self.chris_obj[p, i, k] * self.chris_obj[l, j, p]
+                if (p, j, k) in self.chris_pattern and (l, i, p) in self.chris_pattern:
+                    einstein_sum -= self.chris_obj[p, j, k] * self.chris_obj[l, i, p]
+            if zero_test(Q1 - Q2 + einstein_sum):   # the terms cancel out, so the component is dropped from the pattern
+                del self.riemann_pattern[l, i, j, k]
+                self.riemann_pattern.pop((l, j, i, k), None)
+                continue
             riemann_tensor[l, i, j, k] = Q1 - Q2 + einstein_sum
         self.riemann_obj = riemann_tensor
 
+    def cal_covariant_riemanntensor(self, strategy):
+        """
+        Calculating the all-covariant riemann tensor [R_lijk] from the second derivatives of the
+        metric tensor and the christoffel symbol of the first kind,
+        Gamma_m,ij = (d_i g_mj + d_j g_mi - d_m g_ij)/2, by
+        R_lijk = (d_k d_j g_li + d_l d_i g_kj - d_l d_j g_ki - d_k d_i g_lj)/2
+                 + g^mn (Gamma_m,kj Gamma_n,li - Gamma_m,ki Gamma_n,lj),
+        so that no derivative of the inverse metric tensor enters its components. Only the
+        algebraically independent components are computed (see riemann_independent_components),
+        the bianchi components are found from them and the rest are filled by symmetry
+
+        Args:
+            strategy [str]: The simplification tier of the components
+
+        Returns:
+            [sympy.tensor]: The all-covariant riemann tensor
+        """
+        dg = self.metric_derivatives
+        first_derivatives = MutableDenseNDimArray.zeros(*(self.ndim,)*3)
+        second_pattern = {}
+        for (a, b), dependence in self.metric_pattern.items():
+            for m in dependence:
+                first_derivatives[m, a, b] = dg[m, a, b]
+                second_pattern[m, a, b] = dependence
+        ddg = DerivativeTable(first_derivatives, self.coord_sys, symmetric=True, strategy=strategy, pattern=second_pattern)
+
+        def second_derivative(n, m, a, b):   # d_n d_m g_ab, taken once for both orders of n and m
+            return ddg[min(n, m), max(n, m), a, b]
+
+        chris_first_kind = MutableDenseNDimArray.zeros(*(self.ndim,)*3)
+        for m, i, j in product(range(self.ndim), repeat=3):
+            chris_first_kind[m, i, j] = Rational(1, 2) * (dg[i, m, j] + dg[j, m, i] - dg[m, i, j])
+        indices = riemann_independent_components(self.ndim)
+        einstein_sums = []
+        for l, i, j, k in indices:
+            einstein_sum = Rational(1, 2) * (second_derivative(k, j, l, i) + second_derivative(l, i, k, j) -
+                                             second_derivative(l, j, k, i) - second_derivative(k, i, l, j))
+            for m, n in self.inverse_metric_pattern:
+                einstein_sum += self.inverse_metric_obj[m, n] * (chris_first_kind[m, k, j] * chris_first_kind[n, l, i] -
+                                                                 chris_first_kind[m, k, i] * chris_first_kind[n, l, j])
+            if zero_test(einstein_sum):   # the terms cancel out (see objects.zerotest)
+                einstein_sum = 0
+            einstein_sums.append(einstein_sum)
+        components = dict(zip(indices, simplify_components(einstein_sums, strategy, indices)))
+        bianchi_components = riemann_bianchi_components(self.ndim)
+        components.update(zip(bianchi_components, simplify_components(
+            [components[index1] - components[index2] for index1, index2 in bianchi_components.values()], strategy,
+            list(bianchi_components))))
+        return fill_riemann_tensor(components, self.ndim)
+
     def get_riemanntensor(self):
         """
         Returns the riemann tensor object
         """
-        return Simplify(self.riemann_obj)
+        if not self.riemann_independent:
+            return Simplify(self.riemann_obj, self.strategy)
+        riemann_tensor = MutableDenseNDimArray.zeros(*(self.ndim,)*4)
+        indices = [(l, i, j, k) for l, i, j, k in product(range(self.ndim), repeat=4) if i < j]
+        components = simplify_components(
+            [self.riemann_obj[index] for index in indices], self.strategy, indices)
+        for index, component in zip(indices, components):
+            riemann_tensor[index] = component
+        for l, i, j, k in product(range(self.ndim), repeat=4):
+            if i > j:
+                riemann_tensor[l, i, j, k] = negative_component(riemann_tensor[l, j, i, k])
+            elif i == j:
+                riemann_tensor[l, i, j, k] = 0
+        return riemann_tensor
+
+    def get_riemanntensor_cse(self):
+        """
+        Returns the riemann tensor in the cse form, with a table of the subexpressions that
+        its components share (see objects.csetensor)
+        """
+        return CSETensor(self.riemann_obj, self.strategy)
+
+    def get_riemann_pattern(self):
+        """
+        Returns the structurally nonzero components of the riemann tensor
+        """
+        return self.riemann_pattern
 
     def get_riemanntensor_type(self):
         """
@@ -67,7 +295,33 @@ class RiemannTensor(ChristoffelSymbol):
         Args:
             xriemann_tensor [sympy.tensor]: Given riemann tensor
         """
-        return Array(einsum('abcd,ak->kbcd', xriemann_tensor, self.metric_obj, optimize='optimal'))
+        return self.contract_metric('abcd,ak->kbcd', xriemann_tensor, self.metric_obj)
+
+    def lower_index_independent(self, xriemann_tensor, strategy):
+        """
+        Lowering the index of the riemann tensor by computing (and simplifying) only its
+        algebraically independent components and filling the rest by symmetry
+
+        Args:
+            xriemann_tensor [sympy.tensor]: Given riemann tensor
+            strategy [str]: The simplification tier of the components
+        """
+        indices = riemann_independent_components(self.ndim)
+        einstein_sums = []
+        for l, i, j, k in indices:
+            if self.metric_diagonal:   # the index is only scaled by g_ll
+                einstein_sums.append(self.metric_obj[l, l] * xriemann_tensor[l, i, j, k])
+                continue
+            einstein_sum = 0
+            for m in range(self.ndim):
+                einstein_sum += self.metric_obj[l, m] * xriemann_tensor[m, i, j, k]
+            einstein_sums.append(einstein_sum)
+        components = dict(zip(indices, simplify_components(einstein_sums, strategy, indices)))
+        bianchi_components = riemann_bianchi_components(self.ndim)
+        components.update(zip(bianchi_components, simplify_components(
+            [components[index1] - components[index2] for index1, index2 in bianchi_components.values()], strategy,
+            list(bianchi_components))))
+        return fill_riemann_tensor(components, self.ndim)
 
     def raise_index(self, xriemann_tensor):
         """
@@ -76,7 +330,7 @@ class RiemannTensor(ChristoffelSymbol):
         Args:
             xriemann_tensor [sympy.tensor]: Given riemann tensor
         """
-        return Array(einsum('abcd,bk->akcd', xriemann_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('abcd,bk->akcd', xriemann_tensor, self.inverse_metric_obj)
 
     def raise_index1(self, xriemann_tensor):
         """
@@ -85,7 +339,7 @@ class RiemannTensor(ChristoffelSymbol):
         Args:
             xriemann_tensor [sympy.tensor]: Given riemann tensor
         """
-        return Array(einsum('akcd,cl->akld', xriemann_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('akcd,cl->akld', xriemann_tensor, self.inverse_metric_obj)
 
     def raise_index2(self, xriemann_tensor):
         """
@@ -94,9 +348,9 @@ class RiemannTensor(ChristoffelSymbol):
         Args:
             xriemann_tensor [sympy.tensor]: Given riemann tensor
         """
-        return Array(einsum('akld,df->aklf', xriemann_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('akld,df->aklf', xriemann_tensor, self.inverse_metric_obj)
 
-    def vary_riemanntensor_type(self, xriemann_tensor, new_type):
+    def vary_riemanntensor_type(self, xriemann_tensor, new_type, strategy=None):
         """
         Varying the type of the riemann tensor
 
@@ -104,18 +358,20 @@ class RiemannTensor(ChristoffelSymbol):
             xriemann_tensor [sympy.tensor]: Given riemann tensor
             new_type [str]: The new type of the riemann tensor. It should be given
             in terms of 'u': contravariant (upper-indices) and 'd': covariant (lower-indices)
+            strategy [str]: The simplification tier of the new riemann tensor. Defaults to
+            the simplification tier of the object
 
         Returns:
             The new riemann tensor for a given type
         """
         self.riemann_type = new_type
-        if new_type == 'dddd':
-            return Simplify(self.lower_index(xriemann_tensor))
-        elif new_type == 'uddd':
-            return Simplify(self.riemann_obj)
-        elif new_type == 'uudd':
-            return Simplify(self.raise_index(xriemann_tensor))
-        elif new_type == 'uuud':
-            return Simplify(self.raise_index1(self.raise_index(xriemann_tensor)))
-        elif new_type == 'uuuu':
-            return Simplify(self.raise_index2(self.raise_index1(self.raise_index(xriemann_tensor))))
+        if strategy is None:
+            strategy = self.strategy
+        if new_type == 'dddd' and self.riemann_engine == 'covariant':   # found without lowering the index
+            return Simplify(self.riemann_covariant_obj, strategy)
+        if new_type == 'dddd' and self.riemann_independent:   # simplified as it is lowered, so cached with its tier
+            steps = {'dddd': ('uddd', lambda xtensor: self.lower_index_independent(xtensor, strategy))}
+            return self.get_index_variant(('Riemann Tensor', strategy), xriemann_tensor, new_type, steps)
+        steps = {'dddd': ('uddd', self.lower_index), 'uudd': ('uddd', self.raise_index),
+                 'uuud': ('uudd', self.raise_index1), 'uuuu': ('uuud', self.raise_index2)}
+        return Simplify(self.get_index_variant('Riemann Tensor', xriemann_tensor, new_type, steps), strategy)
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+from copy import copy
+
+from objects.diskcache import disk_cache_key, load_tensor, store_tensor
+from objects.grtensors.christoffelsymbol import ChristoffelSymbol
+from objects.grtensors.einsteintensor import EinsteinTensor
+from objects.grtensors.kretschmannscalar import KretschmannScalar
+from objects.grtensors.metrictensor import MetricTensor
+from objects.grtensors.ricciscalar import RicciScalar
+from objects.grtensors.riccitensor import RicciTensor
+from objects.grtensors.riemanntensor import RiemannTensor
+from objects.grtensors.tracelessriccitensor import TracelessRicciTensor
+from objects.grtensors.weyltensor import WeylTensor
+from objects.simplifyobjects import timeout_scope
+
+# The parent object (or objects), the class and the calculation step of each grtensor object. The
+# ricci tensor is found from the christoffel symbol, without the riemann tensor
+grtensor_chain = {
+    'Metric Tensor': (None, MetricTensor, None),
+    'Inverse Metric Tensor': ('Metric Tensor', MetricTensor, None),
+    'Christoffel Symbol': ('Metric Tensor', ChristoffelSymbol, ChristoffelSymbol.cal_christoffelsymbol),
+    'Riemann Tensor': ('Christoffel Symbol', RiemannTensor, RiemannTensor.cal_riemanntensor),
+    'Ricci Tensor': ('Christoffel Symbol', RicciTensor, RicciTensor.cal_riccitensor),
+    'Ricci Scalar': ('Ricci Tensor', RicciScalar, RicciScalar.cal_ricciscalar),
+    'Weyl Tensor': (('Ricci Scalar', 'Riemann Tensor'), WeylTensor, WeylTensor.cal_weyltensor),
+    'Traceless Ricci Tensor': ('Ricci Scalar', TracelessRicciTensor, TracelessRicciTensor.cal_trclss_riccitensor),
+    'Einstein Tensor': ('Ricci Scalar', EinsteinTensor, EinsteinTensor.cal_einsteintensor),
+    'Kretschmann Scalar': ('Riemann Tensor', KretschmannScalar, KretschmannScalar.cal_kretschmannscalar)
+}
+
+# The methods that give each grtensor (simplified) in its default type and in a given type
+grtensor_getters = {
+    'Metric Tensor': ('get_metrictensor', 'vary_metrictensor_type'),
+    'Inverse Metric Tensor': ('get_inverse', None),
+    'Christoffel Symbol': ('get_christoffelsymbol', 'vary_christoffelsymbol_type'),
+    'Riemann Tensor': ('get_riemanntensor', 'vary_riemanntensor_type'),
+    'Ricci Tensor': ('get_riccitensor', 'vary_riccitensor_type'),
+    'Ricci Scalar': ('get_ricciscalar', None),
+    'Weyl Tensor': ('get_weyltensor', 'vary_weyltensor_type'),
+    'Traceless Ricci Tensor': ('get_trclss_riccitensor', 'vary_trclss_riccitensor_type'),
+    'Einstein Tensor': ('get_einsteintensor', 'vary_einsteintensor_type'),
+    'Kretschmann Scalar': ('get_kretschmannscalar', None)
+}
+
+
+class Spacetime(object):
+    def __init__(self, metric_tensor, coord_sys, strategy='full', engine='coordinate', coframe=None):
+        """
+        Creating the spacetime context of a given metric. Each grtensor object is computed
+        lazily, on its first access, and then shared by every object that is built on top of it
+
+        Args:
+            metric_tensor [list]: The metric tensor, provided by the user
+            coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+            engine [str]: The algorithm of the curvature tensors; 'coordinate', 'covariant', 'cartan' or
+            'rational'. Defaults to 'coordinate'
+            coframe [list]: The orthonormal coframe of the 'cartan' engine. Built from the
+            metric tensor if it is not given
+
+        Returns:
+            self.grtensor_objs [dict]: The grtensor objects that are computed so far
+            self.tensors [dict]: The simplified tensors that are given so far (see get_tensor)
+            self.timed_out_tensors [set]: The tensors whose components ran out of the time budget
+            self.cal_options [dict]: The options of the calculation steps of the grtensor objects
+        """
+        self.metric_tensor = metric_tensor
+        self.coord_sys = coord_sys
+        self.strategy = strategy
+        self.engine = engine
+        self.coframe = coframe
+        self.grtensor_objs = {}
+        self.tensors = {}
+        self.timed_out_tensors = set()
+        self.cal_options = {'Christoffel Symbol': {'engine': engine}, 'Riemann Tensor': {'engine': engine, 'coframe': coframe}}
+
+    def get_grtensor(self, tensor_object):
+        """
+        Returns the grtensor object, computing it (and its parents) only if it is not computed yet
+
+        Args:
+            tensor_object [str]: The name of the grtensor object (metric tensor, riemann tensor, etc.)
+        """
+        if tensor_object not in self.grtensor_objs:
+            parent, xclass, cal_step = grtensor_chain[tensor_object]
+            if parent is None:
+                xobject = xclass(self.metric_tensor, self.coord_sys, strategy=self.strategy)
+            else:
+                parents = (parent,) if isinstance(parent, str) else parent
+                xobject = extend_grtensor([self.get_grtensor(xparent) for xparent in parents], xclass)
+                if cal_step is not None:
+                    cal_step(xobject, **self.cal_options.get(tensor_object, {}))
+            self.grtensor_objs[tensor_object] = xobject
+        return self.grtensor_objs[tensor_object]
+
+    def get_tensor(self, tensor_object, tensor_type=''):
+        """
+        Returns the simplified tensor of a grtensor object in a given type. The tensor is read
+        from the disk cache (see objects.diskcache) if it is computed in a previous session,
+        otherwise it is computed and stored there. The components that run out of the time budget
+        of the simplification are recorded with the grtensor object (see objects.simplifyobjects),
+        and a tensor with such components (or one found from such a tensor) is not stored
+
+        Args:
+            tensor_object [str]: The name of the grtensor object (metric tensor, riemann tensor, etc.)
+            tensor_type [str]: The type of the tensor. Given in terms of 'u': contravariant
+            and 'd': covariant. Defaults to the default type of the tensor
+        """
+        if (tensor_object, tensor_type) not in self.tensors:
+            key = disk_cache_key(self.metric_tensor, self.coord_sys, tensor_object, tensor_type, self.strategy,
+                                 self.engine, self.coframe)
+            tensor = load_tensor(key)
+            if tensor is None:
+                getter, type_getter = grtensor_getters[tensor_object]
+                with timeout_scope(tensor_object) as timeouts:   # the components that run out of the time budget are recorded with the object
+                    xobject = self.get_grtensor(tensor_object)
+                    if tensor_type == '':
+                        tensor = getattr(xobject, getter)()
+                    else:   # the other types are found from the cached types of the object (see get_index_variant)
+                        tensor = getattr(xobject, type_getter)(self.get_tensor(tensor_object), tensor_type)
+                if timeouts or (tensor_object, '') in self.timed_out_tensors:
+                    self.timed_out_tensors.add((tensor_object, tensor_type))   # not as simplified as it should be
+                else:
+                    store_tensor(key, tensor)
+            self.tensors[tensor_object, tensor_type] = tensor
+        return self.tensors[tensor_object, tensor_type]
+
+
+def extend_grtensor(xobjects, xclass):
+    """
+    Creating an object of the given grtensor class on top of already computed objects of its
+    parent classes, without running the shared part of the chain again. The attributes of all
+    the given objects are merged (e.g., the riemann tensor and the ricci scalar of the weyl tensor).
+    The patterns are copied, so that a change of the new object never reaches its parents or its
+    siblings. The memo caches (the index variants, the derivative tables, etc.) are shared, as
+    their entries are keyed by the tensors that they are found from, so a type or a derivative
+    that one object computes is not computed again by its relatives
+
+    Args:
+        xobjects [list]: The computed grtensor objects
+        xclass [type]: The grtensor class that inherits from the classes of xobjects
+    """
+    new_object = xclass.__new__(xclass)
+    for xobject in xobjects:
+        new_object.__dict__.update((name, copy(value) if name.endswith('_pattern') else value)
+                                   for name, value in xobject.__dict__.items())
+    return new_object
+
+
+# The spacetimes of the most recently used metrics
+spacetimes = OrderedDict()
+max_spacetimes = 8
+
+
+def get_spacetime(metric_tensor, coord_sys, strategy='full', engine='coordinate', coframe=None):
+    """
+    Returns the spacetime context of a given metric, reusing the one of a previous call
+    if the metric, the coordinate system, the simplification tier and the curvature
+    engine are the same
+
+    Args:
+        metric_tensor [list]: The metric tensor, provided by the user
+        coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+        strategy [str]: The simplification tier of the results. Defaults to 'full'
+        engine [str]: The algorithm of the curvature tensors; 'coordinate', 'covariant', 'cartan' or
+        'rational'. Defaults to 'coordinate'
+        coframe [list]: The orthonormal coframe of the 'cartan' engine. Built from the
+        metric tensor if it is not given
+    """
+    key = (tuple(tuple(row) for row in metric_tensor), tuple(coord_sys), strategy, engine,
+           None if coframe is None else tuple(tuple(row) for row in coframe))
+    if key in spacetimes:
+        spacetimes.move_to_end(key)
+    else:
+        spacetimes[key] = Spacetime(metric_tensor, coord_sys, strategy, engine, coframe)
+        if len(spacetimes) > max_spacetimes:
+            spacetimes.popitem(last=False)
+    return spacetimes[key]
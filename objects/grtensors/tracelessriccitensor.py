@@ -1,38 +1,48 @@
 from itertools import product
 
-from numpy import einsum, zeros
 from objects.grtensors.ricciscalar import RicciScalar
+from objects.packedtensor import SymmetricTensor
 from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray
+from sympy import Rational
 
 
 class TracelessRicciTensor(RicciScalar):
-    def __init__(self, metric_tensor, coord_sys):
+    def __init__(self, metric_tensor, coord_sys, strategy='full'):
         """
         Creating the traceless ricci tensor object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+        """
+        RicciScalar.__init__(self, metric_tensor, coord_sys, strategy=strategy)
+        self.cal_trclss_riccitensor()
+
+    def cal_trclss_riccitensor(self):
+        """
+        Calculating the traceless ricci tensor from the ricci tensor and ricci scalar of the object
 
         Returns:
             self.trclss_riccitensor_type [str]: Type of the traceless ricci tensor. Default type is 'dd'
-            self.trclss_riccitensor_obj [sympy.tensor]: The traceless ricci tensor, Z_ij
+            self.trclss_riccitensor_obj [SymmetricTensor]: The traceless ricci tensor, Z_ij
 
         """
-        RicciScalar.__init__(self, metric_tensor, coord_sys)
         self.trclss_riccitensor_type = 'dd'
-        trclss_ricci_tensor = MutableDenseNDimArray(zeros((self.ndim,)*2))
+        trclss_ricci_tensor = SymmetricTensor(self.ndim)
         for i, k in product(range(self.ndim), repeat=2):
+            if i > k:   # stored once with its symmetric component (see objects.packedtensor)
+                continue
             trclss_ricci_tensor[i, k] = self.riccitensor_obj[i, k] - \
-                (1/self.ndim) * self.ricciscalar_obj * self.metric_obj[i, k]
+                Rational(1, self.ndim) * self.ricciscalar_obj * self.metric_obj[i, k]
         self.trclss_riccitensor_obj = trclss_ricci_tensor
 
     def get_trclss_riccitensor(self):
         """
         Returns the traceless ricci tensor object
         """
-        return Simplify(self.trclss_riccitensor_obj)
+        return Simplify(self.trclss_riccitensor_obj, self.strategy)
 
     def get_trclss_riccitensor_type(self):
         """
@@ -47,7 +57,7 @@ class TracelessRicciTensor(RicciScalar):
         Args:
             xtrclss_ricci_tensor [sympy.tensor]: Given traceless ricci tensor
         """
-        return Array(einsum('ij,jk->ki', xtrclss_riccitensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('ij,jk->ki', xtrclss_riccitensor, self.inverse_metric_obj)
 
     def vary_trclss_riccitensor_type(self, xtrclss_riccitensor, new_type):
         """
@@ -62,9 +72,6 @@ class TracelessRicciTensor(RicciScalar):
             The new traceless ricci tensor for a given type
         """
         self.trclss_riccitensor_type = new_type
-        if new_type == 'dd':
-            return Simplify(self.trclss_riccitensor_obj)
-        elif new_type == 'ud':
-            return Simplify(self.raise_index(xtrclss_riccitensor))
-        elif new_type == 'uu':
-            return Simplify(self.raise_index(self.raise_index(xtrclss_riccitensor)))
+        steps = {'ud': ('dd', self.raise_index), 'uu': ('ud', self.raise_index)}
+        return Simplify(self.get_index_variant('Traceless Ricci Tensor', xtrclss_riccitensor, new_type, steps),
+                        self.strategy)
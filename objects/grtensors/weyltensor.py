@@ -1,34 +1,43 @@
 from itertools import product
 
-from numpy import einsum, zeros
+from objects.csetensor import CSETensor
 from objects.grtensors.ricciscalar import RicciScalar
-from objects.simplifyobjects import Simplify
-from sympy import Array, MutableDenseNDimArray
+from objects.grtensors.riemanntensor import RiemannTensor
+from objects.simplifyobjects import Simplify, intermediate_strategy
+from sympy import MutableDenseNDimArray, Rational
 
 
-class WeylTensor(RicciScalar):
-    def __init__(self, metric_tensor, coord_sys):
+class WeylTensor(RicciScalar, RiemannTensor):
+    def __init__(self, metric_tensor, coord_sys, strategy='full'):
         """
         Creating the weyl tensor object
 
         Args:
             metric_tensor [list]: The metric tensor, provided by the user
             coord_sys [list]: The coordinate system given as a list (e.g., [t,x,y,z])
+            strategy [str]: The simplification tier of the results; 'none', 'cheap', 'trig'
+            or 'full'. Defaults to 'full'
+        """
+        RicciScalar.__init__(self, metric_tensor, coord_sys, strategy=strategy)
+        self.cal_riemanntensor()   # the ricci tensor is found without the riemann tensor
+        self.cal_weyltensor()
+
+    def cal_weyltensor(self):
+        """
+        Calculating the weyl tensor from the riemann tensor, ricci tensor and ricci scalar of the object
 
         Returns:
             self.weyltensor_type [str]: Type of the weyl tensor. Default type is 'dddd'
             self.weyltensor_obj [sympy.tensor]: The weyl tensor, C_iklm
         """
-        RicciScalar.__init__(self, metric_tensor, coord_sys)
         self.weyltensor_type = 'dddd'
-        weyl_tensor = MutableDenseNDimArray(zeros((self.ndim,)*4))
-        riemanntensor_13 = self.get_riemanntensor()
+        weyl_tensor = MutableDenseNDimArray.zeros(*(self.ndim,)*4)
         riemanntensor_04 = self.vary_riemanntensor_type(
-            riemanntensor_13, 'dddd')
+            self.riemann_obj, 'dddd', intermediate_strategy(self.strategy))
         for i, k, l, m in product(range(self.ndim), repeat=4):
-            I_1 = (self.ndim-2)**(-1) * (self.riccitensor_obj[i, m]*self.metric_obj[k, l] - self.riccitensor_obj[i, l] *
+            I_1 = Rational(1, self.ndim-2) * (self.riccitensor_obj[i, m]*self.metric_obj[k, l] - self.riccitensor_obj[i, l] *
                                          self.metric_obj[k, m] + self.riccitensor_obj[k, l]*self.metric_obj[i, m] - self.riccitensor_obj[k, m]*self.metric_obj[i, l])
-            I_2 = ((self.ndim-1)*(self.ndim-2))**(-1) * self.ricciscalar_obj * \
+            I_2 = Rational(1, (self.ndim-1)*(self.ndim-2)) * self.ricciscalar_obj * \
                 (self.metric_obj[i, l]*self.metric_obj[k, m] -
                  self.metric_obj[i, m]*self.metric_obj[k, l])
             weyl_tensor[i, k, l, m] = riemanntensor_04[i, k, l, m] + I_1 + I_2
@@ -38,7 +47,14 @@ class WeylTensor(RicciScalar):
         """
         Returns the weyl tensor object
         """
-        return Simplify(self.weyltensor_obj)
+        return Simplify(self.weyltensor_obj, self.strategy)
+
+    def get_weyltensor_cse(self):
+        """
+        Returns the weyl tensor in the cse form, with a table of the subexpressions that
+        its components share (see objects.csetensor)
+        """
+        return CSETensor(self.weyltensor_obj, self.strategy)
 
     def get_weyltensor_type(self):
         """
@@ -53,7 +69,7 @@ class WeylTensor(RicciScalar):
         Args:
             xweyl_tensor [sympy.tensor]: Given weyl tensor
         """
-        return Array(einsum('iklm,ai->aklm', xweyl_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('iklm,ai->aklm', xweyl_tensor, self.inverse_metric_obj)
 
     def raise_index1(self, xweyl_tensor):
         """
@@ -62,7 +78,7 @@ class WeylTensor(RicciScalar):
         Args:
             xweyl_tensor [sympy.tensor]: Given weyl tensor
         """
-        return Array(einsum('aklm,bk->ablm', xweyl_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('aklm,bk->ablm', xweyl_tensor, self.inverse_metric_obj)
 
     def raise_index2(self, xweyl_tensor):
         """
@@ -71,7 +87,7 @@ class WeylTensor(RicciScalar):
         Args:
             xweyl_tensor [sympy.tensor]: Given weyl tensor
         """
-        return Array(einsum('ablm,cl->abcm', xweyl_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('ablm,cl->abcm', xweyl_tensor, self.inverse_metric_obj)
 
     def raise_index3(self, xweyl_tensor):
         """
@@ -80,7 +96,7 @@ class WeylTensor(RicciScalar):
         Args:
             xweyl_tensor [sympy.tensor]: Given weyl tensor
         """
-        return Array(einsum('abcm,md->abcd', xweyl_tensor, self.inverse_metric_obj, optimize='optimal'))
+        return self.contract_metric('abcm,md->abcd', xweyl_tensor, self.inverse_metric_obj)
 
     def vary_weyltensor_type(self, xweyl_tensor, new_type):
         """
@@ -95,13 +111,6 @@ class WeylTensor(RicciScalar):
             The new weyl tensor for a given type
         """
         self.weyltensor_type = new_type
-        if new_type == 'dddd':
-            return Simplify(self.weyltensor_obj)
-        elif new_type == 'uddd':
-            return Simplify(self.raise_index(xweyl_tensor))
-        elif new_type == 'uudd':
-            return Simplify(self.raise_index1(self.raise_index(xweyl_tensor)))
-        elif new_type == 'uuud':
-            return Simplify(self.raise_index2(self.raise_index1(self.raise_index(xweyl_tensor))))
-        elif new_type == 'uuuu':
-            return Simplify(self.raise_index3(self.raise_index2(self.raise_index1(self.raise_index(xweyl_tensor)))))
+        steps = {'uddd': ('dddd', self.raise_index), 'uudd': ('uddd', self.raise_index1),
+                 'uuud': ('uudd', self.raise_index2), 'uuuu': ('uuud', self.raise_index3)}
+        return Simplify(self.get_index_variant('Weyl Tensor', xweyl_tensor, new_type, steps), self.strategy)
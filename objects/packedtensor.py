@@ -0,0 +1,235 @@
+# Creating compact containers of the tensors with index symmetries (e.g., the ricci tensor and the
+# all-covariant riemann tensor), which store only their independent components and find the
+# others by the symmetries on access
+
+from abc import ABC, abstractmethod
+from itertools import product
+
+from sympy import Array, Mul, S, factor_terms, sympify
+
+
+def riemann_canonical_index(l, i, j, k):
+    """
+    Finding the canonical component of the all-covariant riemann tensor [R_lijk] that a given
+    component is equal to, up to a sign. R_lijk is antisymmetric in (l,k) and in (i,j), and it
+    is symmetric under the exchange of the pairs (l,k) and (j,i)
+
+    Args:
+        l,i,j,k [int]: Coordinate indices; (0-ndim)
+
+    Returns:
+        [tuple]: The sign (0 if the component vanishes identically) and the canonical index
+    """
+    if l == k or i == j:
+        return (0, None)
+    sign = 1
+    a, b, c, d = l, k, j, i   # the pairs (a,b) and (c,d) of the component
+    if a > b:
+        a, b, sign = b, a, -sign
+    if c > d:
+        c, d, sign = d, c, -sign
+    if (a, b) > (c, d):
+        a, b, c, d = c, d, a, b
+    return (sign, (a, d, c, b))
+
+
+def negative_component(component):
+    """
+    Returns the negative of a component in a canonical form, with the common factors of its sums
+    taken out and the sign taken into a sum of its numerator if it has one (e.g., r_s(r - r_s)/r^4
+    rather than -r_s(-r + r_s)/r^4), so that the components that are filled by an antisymmetry
+    read like the simplified ones
+
+    Args:
+        component [sympy.symbol]: Given component
+    """
+    component = factor_terms(-sympify(component))
+    coefficient, factors = component.as_coeff_mul()
+    if coefficient.is_negative:
+        for position, factor in enumerate(factors):
+            if factor.is_Add:
+                return Mul(-coefficient, *factors[:position], -factor, *factors[position + 1:])
+    return component
+
+
+# The positions of the canonical components of the riemann-symmetric tensors, for each dimension
+riemann_positions = {}
+
+
+class PackedTensor(ABC):
+    __slots__ = ('ndim', 'components')
+    tensor_rank = None
+
+    def __init__(self, ndim, components=None):
+        """
+        Creating a packed tensor, whose independent components are stored in a flat list
+
+        Args:
+            ndim [int]: Dimension of the space
+            components [list]: The independent components, in the order of the positions of the
+            class. All zero if they are not given
+
+        Returns:
+            self.ndim [int]: Dimension of the space
+            self.components [list]: The independent components
+        """
+        self.ndim = ndim
+        if components is None:
+            components = [S.Zero] * self.packed_size(ndim)
+        self.components = [sympify(component) for component in components]
+
+    @classmethod
+    @abstractmethod
+    def packed_size(cls, ndim):
+        """
+        Returns the number of the independent components of the tensor in a given dimension
+        """
+
+    @abstractmethod
+    def position(self, index):
+        """
+        Finding the independent component that a given component is equal to, up to a sign
+
+        Args:
+            index [tuple]: The indices of the component
+
+        Returns:
+            [tuple]: The sign (0 if the component vanishes identically) and the position of the
+            independent component
+        """
+
+    def component_indices(self):
+        """
+        Returns the indices of the independent components, in the order of their positions
+        """
+        indices = [None] * len(self.components)
+        for index in product(range(self.ndim), repeat=self.tensor_rank):
+            sign, position = self.position(index)
+            if sign == 1 and indices[position] is None:
+                indices[position] = index
+        return indices
+
+    @property
+    def shape(self):
+        return (self.ndim,) * self.tensor_rank
+
+    def rank(self):
+        return self.tensor_rank
+
+    def __len__(self):
+        return self.ndim**self.tensor_rank
+
+    def __getitem__(self, index):
+        """
+        Returns a component of the tensor, or the subtensor of a partial index (e.g., x[0][0])
+
+        Args:
+            index [tuple/int]: The indices of the component
+        """
+        if isinstance(index, tuple) and len(index) == self.tensor_rank:
+            sign, position = self.position(index)
+            if sign == 0:
+                return S.Zero
+            return self.components[position] if sign == 1 else negative_component(self.components[position])
+        return self.to_array()[index]
+
+    def __setitem__(self, index, value):
+        """
+        Setting a component of the tensor, and all the components that are fixed by it
+
+        Args:
+            index [tuple]: The indices of the component
+            value [sympy.symbol]: The value of the component
+        """
+        sign, position = self.position(index)
+        if sign == 0:
+            if value != 0:
+                raise ValueError('The component {0} vanishes by the symmetries of the tensor'.format(index))
+            return
+        self.components[position] = sympify(value) if sign == 1 else negative_component(value)
+
+    def __iter__(self):
+        return iter(self.to_array())
+
+    def __eq__(self, other):
+        if isinstance(other, PackedTensor):
+            return type(self) == type(other) and self.ndim == other.ndim and self.components == other.components
+        return self.to_array() == other
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.ndim, tuple(self.components)))
+
+    def tolist(self):
+        return self.to_array().tolist()
+
+    def reshape(self, *shape):
+        return self.to_array().reshape(*shape)
+
+    def to_array(self):
+        """
+        Returns the tensor as a sympy array of all its components
+        """
+        return Array([self[index] for index in product(range(self.ndim), repeat=self.tensor_rank)], self.shape)
+
+    def applyfunc(self, function):
+        """
+        Applying a function to the independent components of the tensor
+
+        Args:
+            function: Given function
+        """
+        return type(self)(self.ndim, [function(component) for component in self.components])
+
+    def _sympy_(self):
+        return self.to_array()
+
+    def _latex(self, printer):
+        return printer._print(self.to_array())
+
+    def _sympystr(self, printer):
+        return printer._print(self.to_array())
+
+    def __repr__(self):
+        return repr(self.to_array())
+
+
+class SymmetricTensor(PackedTensor):
+    __slots__ = ()
+    tensor_rank = 2
+
+    @classmethod
+    def packed_size(cls, ndim):
+        return ndim * (ndim + 1) // 2
+
+    def position(self, index):
+        i, k = index
+        if i > k:
+            i, k = k, i
+        return (1, i * self.ndim - i * (i - 1) // 2 + k - i)
+
+
+class RiemannSymmetricTensor(PackedTensor):
+    __slots__ = ()
+    tensor_rank = 4
+
+    @classmethod
+    def canonical_positions(cls, ndim):
+        """
+        Returns the positions of the canonical components (see riemann_canonical_index) in a
+        given dimension, i.e. one for each pair of the pairs of antisymmetric indices
+        """
+        if ndim not in riemann_positions:
+            canonical = [index for index in product(range(ndim), repeat=4)
+                         if riemann_canonical_index(*index) == (1, index)]
+            riemann_positions[ndim] = {index: position for position, index in enumerate(canonical)}
+        return riemann_positions[ndim]
+
+    @classmethod
+    def packed_size(cls, ndim):
+        return len(cls.canonical_positions(ndim))
+
+    def position(self, index):
+        sign, canonical = riemann_canonical_index(*index)
+        if sign == 0:
+            return (0, None)
+        return (sign, self.canonical_positions(self.ndim)[canonical])
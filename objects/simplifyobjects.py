@@ -1,19 +1,432 @@
 # Creating a simplification function that applies to all objects (fields and tensors)
 
-from sympy import nsimplify, simplify
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import product
+from multiprocessing import Pipe, Process
+from os import cpu_count
 
+from objects.packedtensor import PackedTensor
+from objects.zerotest import zero_test
+from sympy import Basic, Float, NDimArray, cancel, diff, nsimplify, simplify, srepr, sympify, together, trigsimp
 
-def Simplify(xobject):
+# The simplification tiers, from the fastest one to the one that gives the most compact results
+simplification_tiers = {
+    'none': None,
+    'cheap': lambda expr: cancel(together(expr)),
+    'trig': trigsimp,
+    'full': simplify
+}
+
+# The number of worker processes that simplify the components of a tensor (or field) in
+# parallel, and their pool. 1 means that the components are simplified serially
+simplify_workers = 1
+simplify_pool = None
+
+# The time budget (in seconds) of simplifying a single component with the 'trig' or 'full' tier,
+# and the worker process that is killed when the budget runs out. None means no time budget. The
+# sessions of the GUI set session_simplify_timeout (see display4D.mainpage)
+simplify_timeout = None
+session_simplify_timeout = 30
+timeout_worker = None
+
+# The components whose simplification ran out of the time budget, as (grtensor object, index)
+# pairs. They are given in the 'cheap' tier instead. Only the most recent ones are kept. The
+# grtensor object is the one of the enclosing timeout_scope (None outside of it), and the
+# timeouts of the scope are collected in scope_timeouts
+max_timed_out_components = 256
+timed_out_components = deque(maxlen=max_timed_out_components)
+timeout_label = None
+scope_timeouts = None
+
+# The simplified components and the derivatives of the most recently used expressions, keyed by
+# the expression and the simplification tier (or the coordinate), and the numbers of the cache
+# hits and misses. 0 capacity turns the cache off
+expression_cache = OrderedDict()
+max_expression_cache = 4096
+expression_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def is_exact(xobject):
     """
-    Simplifies the given tensor or field via simplify and nsimplify functions
+    Checking if the given tensor or field is free of floating-point numbers
 
     Args:
         xobject: Given tensor or field object
+    """
+    try:
+        return not sympify(xobject).has(Float)
+    except:   # objects that sympify can not turn into a single expression (e.g., nested lists)
+        return False
+
+
+def intermediate_strategy(strategy):
+    """
+    Returns the simplification tier of the intermediate stages (derivatives, index raising, etc.)
+    of a computation whose final result is simplified with the given strategy
+
+    Args:
+        strategy [str]: The simplification tier of the final result
+    """
+    if strategy == 'none':
+        return 'none'
+    return 'cheap'
+
+
+def set_simplify_workers(workers):
+    """
+    Setting the number of worker processes that simplify the components in parallel
+
+    Args:
+        workers [int]: The number of worker processes. 1 simplifies the components serially,
+        None uses all the cores of the machine
+    """
+    global simplify_workers, simplify_pool
+    if workers is None:
+        workers = cpu_count() or 1
+    if simplify_pool is not None:
+        simplify_pool.shutdown()
+        simplify_pool = None
+    simplify_workers = max(int(workers), 1)
+
+
+def set_expression_cache(capacity=4096):
+    """
+    Setting the capacity of the cache of the simplified components and the derivatives
+
+    Args:
+        capacity [int]: The number of the cached expressions. 0 turns the cache off. Defaults to 4096
+    """
+    global max_expression_cache
+    max_expression_cache = capacity
+    while len(expression_cache) > max_expression_cache:
+        expression_cache.popitem(last=False)
+
+
+def clear_expression_cache():
+    """
+    Clearing the cache of the simplified components and the derivatives (e.g., at the start of
+    a new session) and its hit and miss counters
+    """
+    expression_cache.clear()
+    expression_cache_stats['hits'] = 0
+    expression_cache_stats['misses'] = 0
+
+
+def get_expression_cache_stats():
+    """
+    Returns the numbers of the cache hits and misses, and the number of the cached expressions
+    """
+    return dict(expression_cache_stats, size=len(expression_cache))
+
+
+def cache_lookup(key):
+    """
+    Returns the cached result of a given key, or None if it is not cached. The hits and the
+    misses are counted
+
+    Args:
+        key [tuple]: The operation ('simplify' or 'diff'), the expression and the simplification
+        tier (or the coordinate)
+    """
+    if key in expression_cache:
+        expression_cache.move_to_end(key)
+        expression_cache_stats['hits'] += 1
+        return expression_cache[key]
+    expression_cache_stats['misses'] += 1
+    return None
+
+
+def cache_store(key, result):
+    """
+    Caching the result of a given key, dropping the least recently used one if the cache is full
+
+    Args:
+        key [tuple]: The operation ('simplify' or 'diff'), the expression and the simplification
+        tier (or the coordinate)
+        result [sympy.symbol]: The result of the operation
+    """
+    if max_expression_cache <= 0:
+        return
+    expression_cache[key] = result
+    expression_cache.move_to_end(key)
+    if len(expression_cache) > max_expression_cache:
+        expression_cache.popitem(last=False)
+
+
+def Diff(xcomponent, coord):
+    """
+    Differentiates the given component with respect to a coordinate. The derivatives are cached,
+    so an expression that is met again is not differentiated again
+
+    Args:
+        xcomponent [sympy.symbol]: Given component
+        coord [sympy.symbol]: The coordinate that the derivative is taken w.r.t
+    """
+    xcomponent = sympify(xcomponent)
+    derivative = cache_lookup(('diff', xcomponent, coord))
+    if derivative is None:
+        derivative = diff(xcomponent, coord)
+        cache_store(('diff', xcomponent, coord), derivative)
+    return derivative
+
+
+def set_simplify_timeout(timeout):
+    """
+    Setting the time budget of simplifying a single component with the 'trig' or 'full' tier
+
+    Args:
+        timeout [float]: The time budget in seconds. None simplifies the components without
+        a time budget
+    """
+    global simplify_timeout
+    simplify_timeout = timeout
+
+
+def clear_timed_out_components():
+    """
+    Clearing the record of the components that ran out of the time budget (e.g., at the start
+    of a new session)
+    """
+    timed_out_components.clear()
+
+
+def get_timed_out_components(tensor_object=None):
+    """
+    Returns the recorded components that ran out of the time budget, as (grtensor object, index)
+    pairs
+
+    Args:
+        tensor_object [str]: The name of the grtensor object whose components are returned.
+        Defaults to all of them
+    """
+    return [(label, index) for label, index in timed_out_components if tensor_object is None or label == tensor_object]
+
+
+@contextmanager
+def timeout_scope(tensor_object):
+    """
+    Recording the components that run out of the time budget within the scope with the given
+    grtensor object. The timeouts of a nested scope are also counted in the enclosing one
+
+    Args:
+        tensor_object [str]: The name of the grtensor object (metric tensor, riemann tensor, etc.)
+
+    Yields:
+        [list]: The (grtensor object, index) pairs of the timeouts within the scope
+    """
+    global timeout_label, scope_timeouts
+    enclosing = (timeout_label, scope_timeouts)
+    timeouts = []
+    timeout_label, scope_timeouts = tensor_object, timeouts
+    try:
+        yield timeouts
+    finally:
+        timeout_label, scope_timeouts = enclosing
+        if scope_timeouts is not None:
+            scope_timeouts.extend(timeouts)
+
+
+def record_timeout(index):
+    """
+    Recording a component that ran out of the time budget
+
+    Args:
+        index [tuple]: The index of the component
+    """
+    timed_out_components.append((timeout_label, index))
+    if scope_timeouts is not None:
+        scope_timeouts.append((timeout_label, index))
+
+
+def get_simplify_pool():
+    """
+    Returns the pool of the worker processes, creating it on its first use
+    """
+    global simplify_pool
+    if simplify_pool is None:
+        simplify_pool = ProcessPoolExecutor(max_workers=simplify_workers)
+    return simplify_pool
+
+
+def timeout_worker_loop(connection):
+    """
+    The loop of the worker process that simplifies the components with a time budget
+
+    Args:
+        connection [multiprocessing.Connection]: The connection to the main process
+    """
+    global simplify_workers, simplify_timeout
+    simplify_workers, simplify_timeout = 1, None
+    while True:
+        component, strategy = connection.recv()
+        connection.send(srepr(simplify_expression(sympify(component), strategy)))
+
+
+def get_timeout_worker():
+    """
+    Returns the worker process (and its connection) that simplifies the components with a
+    time budget, starting it if it is not running
+    """
+    global timeout_worker
+    if timeout_worker is None or not timeout_worker[0].is_alive():
+        connection, worker_connection = Pipe()
+        process = Process(target=timeout_worker_loop, args=(worker_connection,), daemon=True)
+        process.start()
+        worker_connection.close()   # so that the death of the worker is seen as the end of the pipe
+        timeout_worker = (process, connection)
+    return timeout_worker
+
+
+def simplify_component(component, strategy, timeout):
+    """
+    Simplifies a single component. If a time budget is given, the component is simplified in
+    the worker process, which is killed if the budget runs out (or restarted if it dies). The
+    component is then given in the 'cheap' tier (within the same budget), or as it is
+
+    Args:
+        component [sympy.symbol]: Given component
+        strategy [str]: The simplification tier
+        timeout [float]: The time budget in seconds, or None
 
     Returns:
-        Simplified version of the object
+        The simplified component and whether the time budget ran out
     """
+    global timeout_worker
+    if timeout is None or strategy not in ('trig', 'full') or component.is_Number:
+        return simplify_expression(component, strategy), False
+    for tier in (strategy, 'cheap'):
+        process, connection = get_timeout_worker()
+        try:
+            connection.send((srepr(component), tier))
+            if connection.poll(timeout):
+                return sympify(connection.recv()), tier != strategy
+        except (EOFError, OSError):   # the worker process died, so it is taken as a timeout
+            pass
+        process.kill()
+        process.join()
+        timeout_worker = None
+    return component, True
+
+
+def simplify_srepr(xcomponent):
+    """
+    Simplifies a component that is sent to a worker process as a srepr string
+
+    Args:
+        xcomponent [tuple]: The srepr string of the component, the simplification tier
+        and the time budget
+
+    Returns:
+        The srepr string of the simplified component and whether the time budget ran out
+    """
+    component, strategy, timeout = xcomponent
+    simplified, timed_out = simplify_component(sympify(component), strategy, timeout)
+    return srepr(simplified), timed_out
+
+
+def simplify_components(components, strategy='full', indices=None):
+    """
+    Simplifies the given components (of a tensor or field) one by one. Each distinct component
+    is simplified only once and, if more than one worker process is set, in parallel. The
+    results are returned in the order of the given components. If the pool can not be used,
+    the components are simplified serially. The components that run out of the time budget
+    are recorded with their indices (see record_timeout). With the 'trig' and 'full' tiers, the components
+    that pass the zero test (see objects.zerotest) are given as 0 without being simplified.
+    The simplified components are cached (see cache_lookup), and each of them is cached as its
+    own simplified form, so that a simplified tensor is not simplified again
+
+    Args:
+        components [list]: Given components
+        strategy [str]: The simplification tier. Defaults to 'full'
+        indices [list]: The indices of the components in their tensor. Defaults to their positions
+    """
+    components = [sympify(component) for component in components]
+    if strategy == 'none':
+        return components
+    simplified = {}
+    for component in dict.fromkeys(components):
+        if not component.is_Number:
+            result = cache_lookup(('simplify', component, strategy))
+            if result is not None:
+                simplified[component] = (result, False)
+    uncached = [component for component in dict.fromkeys(components) if component not in simplified]
+    if strategy in ('trig', 'full'):
+        for component in uncached:
+            if not component.is_Number and zero_test(component):
+                simplified[component] = (sympify(0), False)
+    distinct = [component for component in uncached if component not in simplified]
+    if simplify_workers > 1 and len(distinct) > 1:
+        try:
+            chunksize = max(len(distinct) // (4*simplify_workers), 1)
+            results = get_simplify_pool().map(simplify_srepr, [(srepr(component), strategy, simplify_timeout)
+                                                               for component in distinct], chunksize=chunksize)
+            simplified.update((component, (sympify(result), timed_out))
+                              for component, (result, timed_out) in zip(distinct, results))
+        except Exception:   # the pool is broken or can not be created on this platform
+            set_simplify_workers(1)
+    for component in distinct:
+        if component not in simplified:
+            simplified[component] = simplify_component(component, strategy, simplify_timeout)
+    for component in uncached:
+        result, timed_out = simplified[component]
+        if not timed_out and not component.is_Number:   # the components that ran out of the time budget are tried again
+            cache_store(('simplify', component, strategy), result)
+            cache_store(('simplify', result, strategy), result)
+    for position, component in enumerate(components):
+        if simplified[component][1]:
+            record_timeout(position if indices is None else indices[position])
+    return [simplified[component][0] for component in components]
+
+
+def simplify_expression(xobject, strategy):
+    """
+    Simplifies the given tensor or field with the given simplification tier, in the
+    current process and without a time budget
+
+    Args:
+        xobject: Given tensor or field object
+        strategy [str]: The simplification tier
+    """
+    if strategy == 'none':
+        return xobject
     try:   # if all components of the tensor (or field) are 0, nsimplify produces error
-        return simplify(nsimplify(xobject))
+        if not is_exact(xobject):
+            xobject = nsimplify(xobject)
+        if strategy == 'full':
+            return simplify(xobject)
+        if isinstance(xobject, NDimArray):
+            return xobject.applyfunc(simplification_tiers[strategy])
+        return simplification_tiers[strategy](xobject)
     except:
         return xobject
+
+
+def Simplify(xobject, strategy='full'):
+    """
+    Simplifies the given tensor or field with the given simplification tier. The
+    nsimplify function is applied first only if the object has floating-point numbers.
+    The components are simplified one by one (see simplify_components), in parallel and with
+    a time budget if they are set
+
+    Args:
+        xobject: Given tensor or field object
+        strategy [str]: The simplification tier; 'none', 'cheap' (cancel and together),
+        'trig' (trigsimp) or 'full' (simplify). Defaults to 'full'
+
+    Returns:
+        Simplified version of the object
+    """
+    if strategy not in simplification_tiers:
+        raise ValueError('Unknown simplification strategy: {0}'.format(strategy))
+    if strategy == 'none':
+        return xobject
+    if isinstance(xobject, NDimArray) and len(xobject.shape) > 0:
+        indices = list(product(*(range(n) for n in xobject.shape)))
+        return type(xobject)(simplify_components(list(xobject.reshape(len(xobject))), strategy, indices), xobject.shape)
+    if isinstance(xobject, PackedTensor):   # only the stored components (see objects.packedtensor)
+        return type(xobject)(xobject.ndim, simplify_components(xobject.components, strategy, xobject.component_indices()))
+    if isinstance(xobject, Basic):
+        return simplify_components([xobject], strategy, [()])[0]
+    return simplify_expression(xobject, strategy)
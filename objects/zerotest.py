@@ -0,0 +1,103 @@
+# Creating a zero test that decides if a component of a tensor (or field) is zero by evaluating
+# it at random points, before any full simplification is tried. A component is found to be zero
+# only if a cheap symbolic check confirms it
+
+from random import Random
+
+from sympy import Add, Derivative, Dummy, Float, Integer, Rational, cancel, simplify, sympify, together
+from sympy.core.function import AppliedUndef
+
+# The number of random points that a component is evaluated at and the seed of the points.
+# 0 trials turns the zero test off
+zero_test_trials = 6
+zero_test_seed = 0
+
+# The size of the set that the points of the exact evaluations are drawn from, and the
+# precision (in digits) of the numerical evaluations
+zero_test_range = 2**31
+zero_test_precision = 50
+
+
+def set_zero_test(trials=6, seed=0):
+    """
+    Setting the number of random points and the seed of the zero test
+
+    Args:
+        trials [int]: The number of random points. 0 turns the zero test off. Defaults to 6
+        seed [int]: The seed of the random points. Defaults to 0
+    """
+    global zero_test_trials, zero_test_seed
+    zero_test_trials = trials
+    zero_test_seed = seed
+
+
+def zero_test(xcomponent):
+    """
+    Testing if a component is zero by evaluating it at random points. The undefined functions
+    (e.g., f(r)) and their derivatives are taken as independent variables. Rational functions are
+    evaluated exactly at random integers, the other components numerically with
+    zero_test_precision digits, at points of both signs unless the symbols are nonnegative. A
+    component that is nonzero at a point is nonzero. A component that is zero at all the points
+    is only found to be zero if its cheap simplification (cancel and together) is 0, so that a
+    zero is never a probabilistic answer
+
+    Args:
+        xcomponent [sympy.symbol]: Given component
+
+    Returns:
+        True if the component is zero, False if it is nonzero, or None if the test is not
+        decisive (e.g., the component can not be evaluated, or it is zero at all the points
+        but its cheap simplification is not 0)
+    """
+    xcomponent = sympify(xcomponent)
+    if xcomponent.is_Number:
+        return xcomponent == 0
+    if zero_test_trials == 0 or xcomponent.has(Float):
+        return None
+    jets = xcomponent.atoms(Derivative) | xcomponent.atoms(AppliedUndef)
+    evaluated = xcomponent.xreplace({jet: Dummy() for jet in jets})
+    symbols = sorted(evaluated.free_symbols, key=str)
+    exact = evaluated.is_rational_function(*symbols)
+    random = Random(zero_test_seed)
+    trials = 0
+    for _ in range(3 * zero_test_trials):   # the points where the component is not defined are skipped
+        if trials == zero_test_trials:
+            break
+        if exact:
+            point = {symbol: Integer(random.randint(1, zero_test_range)) for symbol in symbols}
+            value = evaluated.xreplace(point)
+            if not value.is_Number or not value.is_finite:
+                continue
+            if value != 0:
+                return False
+        else:
+            point = {symbol: Rational(random.randint(2**19, 3 * 2**19), 2**20) *
+                     (1 if symbol.is_nonnegative else random.choice((1, -1))) for symbol in symbols}
+            value = abs(evaluated.xreplace(point).evalf(zero_test_precision))
+            if not value.is_Number or not value.is_finite:
+                continue
+            terms = [abs(term.xreplace(point).evalf(zero_test_precision)) for term in Add.make_args(evaluated)]
+            if not all(term.is_Number and term.is_finite for term in terms):
+                continue
+            if value > max(terms) * Rational(1, 10**(zero_test_precision // 2)):
+                return False
+        trials += 1
+    if trials < zero_test_trials:
+        return None
+    if cancel(together(xcomponent)) == 0:   # confirmed symbolically
+        return True
+    return None
+
+
+def is_zero(xcomponent):
+    """
+    Checking if a component is zero. The zero test is applied first and the component is fully
+    simplified only if the zero test is not decisive
+
+    Args:
+        xcomponent [sympy.symbol]: Given component
+    """
+    zero = zero_test(xcomponent)
+    if zero is None:
+        return simplify(xcomponent) == 0
+    return zero
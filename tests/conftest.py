@@ -0,0 +1,13 @@
+# Putting the root of the repository (and display4D, for the coordinates4d presets) on the
+# import path of the tests, with the disk cache turned off
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, 'display4D'))
+sys.path.insert(0, root)
+
+from objects import diskcache  # noqa: E402
+
+diskcache.set_disk_cache(None)
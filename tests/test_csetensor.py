@@ -0,0 +1,37 @@
+# Checking the cse form of the tensors against the tensors themselves, and its use in the
+# equations of the large tensors
+
+import pytest
+from equations import grtensorsEP
+from objects.grtensors import RiemannTensor
+from sympy import Array, simplify, sin, symbols
+
+
+@pytest.fixture
+def schwarzschild():
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    M = symbols('M')
+    metric_tensor = [[-(1 - 2*M/r), 0, 0, 0], [0, 1/(1 - 2*M/r), 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    return metric_tensor, coord_sys
+
+
+def test_cse_tensor(schwarzschild):
+    metric_tensor, coord_sys = schwarzschild
+    riemann = RiemannTensor(metric_tensor, coord_sys, strategy='cheap')
+    cse_tensor = riemann.get_riemanntensor_cse()
+    riemann_tensor = Array(riemann.get_riemanntensor().tolist())
+    assert cse_tensor.subexpressions
+    assert all(simplify(component) == 0 for component in (cse_tensor.get_tensor() - riemann_tensor).reshape(256))
+    point = {symbols('M'): 1, coord_sys[1]: 3, coord_sys[2]: 0.5}
+    function = cse_tensor.lambdify([symbols('M')] + coord_sys)
+    values = function(1, 0, 3, 0.5, 0)
+    expected = riemann_tensor.subs(point).reshape(256)
+    assert all(abs(value - float(component)) < 1e-12 for value, component in zip(values, expected))
+
+
+def test_cse_equation(schwarzschild, monkeypatch):
+    metric_tensor, coord_sys = schwarzschild
+    assert '\\begin{aligned}' not in grtensorsEP.tensor_ep(metric_tensor, coord_sys, 'Riemann Tensor', strategy='cheap')
+    monkeypatch.setattr(grtensorsEP, 'cse_threshold', 0)
+    assert grtensorsEP.tensor_ep(metric_tensor, coord_sys, 'Riemann Tensor', strategy='cheap').startswith('$$\\begin{aligned}')
+    assert grtensorsEP.tensor_ep(metric_tensor, coord_sys, 'Kretschmann Scalar', strategy='cheap').startswith('$$K = ')
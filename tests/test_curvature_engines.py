@@ -0,0 +1,162 @@
+# Checking the curvature engines against a reference computation of the christoffel symbol, the
+# riemann tensor and the ricci tensor by their textbook formulas, on the coordinates4d presets
+
+from functools import lru_cache
+from itertools import product
+
+import pytest
+from coordinates import coordinates4d
+from objects.grtensors import ChristoffelSymbol, RicciScalar, RicciTensor, RiemannTensor, Spacetime
+from sympy import Array, Matrix, Rational, diff, simplify, symbols, sympify
+
+presets = ['Cartesian Coordinates', 'Cylindrical Coordinates', 'Spherical Coordinates',
+           'Conform-Compactified Coordinates', 'Rindler Coordinates', 'Schwarzschild Coordinates',
+           'Eddington-Finkelstein Coordinates']
+
+
+@lru_cache(maxsize=None)
+def preset_metric(name):
+    """
+    Returns the metric tensor and the coordinate system of a preset
+    """
+    metric_tensor, coord_sys = coordinates4d(name)
+    return [[sympify(component) for component in row] for row in metric_tensor], list(symbols(' '.join(coord_sys)))
+
+
+@lru_cache(maxsize=None)
+def reference_christoffel(name):
+    """
+    The christoffel symbol, Gamma^m_ij = g^mk (d_j g_ki + d_i g_kj - d_k g_ij)/2, as a dict
+    """
+    metric_tensor, coord_sys = preset_metric(name)
+    g = Matrix(metric_tensor)
+    inverse = g.inv()
+    ndim = len(coord_sys)
+    return {(m, i, j): sum(inverse[m, k] * (diff(g[k, i], coord_sys[j]) + diff(g[k, j], coord_sys[i]) -
+                                            diff(g[i, j], coord_sys[k])) for k in range(ndim)) * Rational(1, 2)
+            for m, i, j in product(range(ndim), repeat=3)}
+
+
+@lru_cache(maxsize=None)
+def reference_riemann(name):
+    """
+    The riemann tensor in the index convention of RiemannTensor,
+    R^l_ijk = d_j Gamma^l_ik - d_i Gamma^l_jk + Gamma^p_ik Gamma^l_jp - Gamma^p_jk Gamma^l_ip, as a dict
+    """
+    _, coord_sys = preset_metric(name)
+    chris = reference_christoffel(name)
+    ndim = len(coord_sys)
+    return {(l, i, j, k): diff(chris[l, i, k], coord_sys[j]) - diff(chris[l, j, k], coord_sys[i]) +
+                          sum(chris[p, i, k] * chris[l, j, p] - chris[p, j, k] * chris[l, i, p] for p in range(ndim))
+            for l, i, j, k in product(range(ndim), repeat=4)}
+
+
+@lru_cache(maxsize=None)
+def reference_ricci(name):
+    """
+    The ricci tensor, R_ik = R^j_ijk, as a dict
+    """
+    _, coord_sys = preset_metric(name)
+    riemann = reference_riemann(name)
+    ndim = len(coord_sys)
+    return {(i, k): sum(riemann[j, i, j, k] for j in range(ndim)) for i, k in product(range(ndim), repeat=2)}
+
+
+def assert_equal_components(xtensor, reference):
+    """
+    Checking that the components of a tensor (an array or a packed tensor) are equal to the
+    reference components. A difference that simplify leaves in a form it does not find to be
+    zero (e.g., of the double angles) is checked by equals
+
+    Args:
+        xtensor [sympy.tensor]: Given tensor
+        reference [dict]: The reference components, by their indices
+    """
+    xtensor = xtensor.to_array() if hasattr(xtensor, 'to_array') else Array(xtensor)
+    for index, component in reference.items():
+        difference = simplify(xtensor[index] - component)
+        assert difference == 0 or difference.equals(0), index
+
+
+def enumerate_components(xtensor):
+    """
+    Returns the components of a tensor (an array or a packed tensor) with their indices
+    """
+    xtensor = xtensor.to_array() if hasattr(xtensor, 'to_array') else Array(xtensor)
+    return [(index, xtensor[index]) for index in product(*(range(n) for n in xtensor.shape))]
+
+
+@pytest.mark.parametrize('name', presets)
+def test_independent_riemann_components(name):
+    metric_tensor, coord_sys = preset_metric(name)
+    independent = RiemannTensor(metric_tensor, coord_sys, independent=True, strategy='cheap')
+    assert_equal_components(independent.get_riemanntensor(), reference_riemann(name))
+    full = RiemannTensor(metric_tensor, coord_sys, independent=False, strategy='cheap')
+    assert_equal_components(full.get_riemanntensor(), reference_riemann(name))
+
+
+@pytest.mark.parametrize('name', [name for name in presets if Matrix(preset_metric(name)[0]).is_diagonal()])
+def test_diagonal_closed_form(name):
+    metric_tensor, coord_sys = preset_metric(name)
+    diagonal = RiemannTensor(metric_tensor, coord_sys, strategy='cheap')
+    assert diagonal.metric_diagonal
+    generic = ChristoffelSymbol(metric_tensor, coord_sys, strategy='cheap')
+    generic.metric_diagonal = False   # the generic path on the same metric
+    generic.cal_christoffelsymbol()
+    RiemannTensor.cal_riemanntensor(generic)
+    ndim = len(coord_sys)
+    assert_equal_components(diagonal.chris_obj, dict(enumerate_components(generic.chris_obj)))
+    for n, m, i, j in product(range(ndim), repeat=4):
+        difference = simplify(diagonal.get_chris_derivative(n, m, i, j) - generic.get_chris_derivative(n, m, i, j))
+        assert difference == 0 or difference.equals(0), (n, m, i, j)
+    assert_equal_components(diagonal.riemann_obj, dict(enumerate_components(generic.riemann_obj)))
+
+
+@pytest.mark.parametrize('name', presets)
+def test_cartan_engine(name):
+    metric_tensor, coord_sys = preset_metric(name)
+    cartan = RiemannTensor(metric_tensor, coord_sys, strategy='cheap', engine='cartan')
+    assert_equal_components(cartan.get_riemanntensor(), reference_riemann(name))
+    coordinate = RiemannTensor(metric_tensor, coord_sys, strategy='cheap')
+    coordinate_dddd = coordinate.vary_riemanntensor_type(coordinate.get_riemanntensor(), 'dddd')
+    assert_equal_components(cartan.vary_riemanntensor_type(cartan.get_riemanntensor(), 'dddd'),
+                            dict(enumerate_components(coordinate_dddd)))
+
+
+@pytest.mark.parametrize('name', presets)
+def test_direct_ricci(name):
+    metric_tensor, coord_sys = preset_metric(name)
+    ricci = RicciTensor(metric_tensor, coord_sys, strategy='cheap')
+    assert not hasattr(ricci, 'riemann_obj')   # found without the riemann tensor
+    assert_equal_components(ricci.get_riccitensor(), reference_ricci(name))
+    inverse = Matrix(metric_tensor).inv()
+    reference_scalar = sum(inverse[i, k] * component for (i, k), component in reference_ricci(name).items())
+    difference = simplify(RicciScalar(metric_tensor, coord_sys, strategy='cheap').get_ricciscalar() - reference_scalar)
+    assert difference == 0 or difference.equals(0)
+
+
+@pytest.mark.parametrize('name', presets)
+def test_covariant_engine(name):
+    metric_tensor, coord_sys = preset_metric(name)
+    covariant = RiemannTensor(metric_tensor, coord_sys, strategy='cheap', engine='covariant')
+    assert_equal_components(covariant.get_riemanntensor(), reference_riemann(name))
+    ndim = len(coord_sys)
+    riemann = reference_riemann(name)
+    reference_dddd = {(m, i, j, k): sum(metric_tensor[m][l] * riemann[l, i, j, k] for l in range(ndim))
+                      for m, i, j, k in product(range(ndim), repeat=4)}
+    assert_equal_components(covariant.vary_riemanntensor_type(covariant.get_riemanntensor(), 'dddd'), reference_dddd)
+
+
+@pytest.mark.parametrize('name', presets)
+def test_rational_engine(name):
+    metric_tensor, coord_sys = preset_metric(name)
+    spacetime = Spacetime(metric_tensor, coord_sys, strategy='cheap', engine='rational')
+    assert spacetime.get_grtensor('Christoffel Symbol').rational_metric is not None
+    assert_equal_components(spacetime.get_grtensor('Christoffel Symbol').get_christoffelsymbol(),
+                            reference_christoffel(name))
+    assert_equal_components(spacetime.get_grtensor('Riemann Tensor').get_riemanntensor(), reference_riemann(name))
+    assert_equal_components(spacetime.get_grtensor('Ricci Tensor').get_riccitensor(), reference_ricci(name))
+    inverse = Matrix(metric_tensor).inv()
+    reference_scalar = sum(inverse[i, k] * component for (i, k), component in reference_ricci(name).items())
+    difference = simplify(spacetime.get_grtensor('Ricci Scalar').get_ricciscalar() - reference_scalar)
+    assert difference == 0 or difference.equals(0)
@@ -0,0 +1,40 @@
+# Checking that the disk cache reads back the tensors that it stores, that its files can only
+# give sympy objects, and that the source is not hashed while the cache is off
+
+import zlib
+
+import pytest
+from objects import diskcache
+from objects.grtensors import Spacetime
+from sympy import Array, sin, symbols
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    diskcache.set_disk_cache(str(tmp_path))
+    yield tmp_path
+    diskcache.set_disk_cache(None)
+
+
+def test_stored_tensor_is_loaded(disk_cache):
+    x, y = symbols('x y')
+    xtensor = Array([[sin(x)/y, 0], [0, x**2]])
+    diskcache.store_tensor('key', xtensor)
+    assert diskcache.load_tensor('key') == xtensor
+    assert diskcache.load_tensor('missing') is None
+
+
+def test_unsafe_file_is_not_evaluated(disk_cache):
+    header = 'grtcgui-cache {0}'.format(diskcache.get_disk_cache_version())
+    for payload in ['__import__("os").getcwd()', 'sin("__import__(\'os\').getcwd()")', 'Symbol.__class__']:
+        with open(diskcache.disk_cache_path('key'), 'wb') as cache_file:
+            cache_file.write(zlib.compress('\n'.join([header, '', payload]).encode()))
+        assert diskcache.load_tensor('key') is None
+
+
+def test_source_is_not_hashed_while_off(monkeypatch):
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    metric_tensor = [[-1, 0, 0, 0], [0, 1, 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    monkeypatch.setattr(diskcache, 'disk_cache_version', None)
+    Spacetime(metric_tensor, coord_sys).get_tensor('Christoffel Symbol')
+    assert diskcache.disk_cache_version is None
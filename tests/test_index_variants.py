@@ -0,0 +1,35 @@
+# Checking that the cache of the index variants keeps apart the types that are found from
+# different tensors of the same object, and that it is shared by the objects of a spacetime
+
+from objects.grtensors import RicciTensor, RiemannTensor, Spacetime
+from sympy import Array, simplify, sin, symbols
+
+
+def test_index_variants_of_different_tensors():
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    metric_tensor = [[-1, 0, 0, 0], [0, 1, 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    ricci = RicciTensor(metric_tensor, coord_sys, strategy='cheap')
+    xtensor = Array([[r if i == k else 0 for k in range(4)] for i in range(4)])
+    zero_variant = ricci.vary_riccitensor_type(ricci.get_riccitensor(), 'uu')
+    variant = ricci.vary_riccitensor_type(xtensor, 'uu')
+    assert all(component == 0 for component in Array(zero_variant.tolist()).reshape(16))
+    assert simplify(variant[2, 2] - 1/r**3) == 0
+    assert ricci.vary_riccitensor_type(xtensor, 'uu') == variant
+
+
+def test_index_variants_are_shared(monkeypatch):
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    M = symbols('M')
+    metric_tensor = [[-(1 - 2*M/r), 0, 0, 0], [0, 1/(1 - 2*M/r), 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    lowerings = []
+    lower_index_independent = RiemannTensor.lower_index_independent
+    def counted_lower_index_independent(self, xriemann_tensor, strategy):
+        lowerings.append(strategy)
+        return lower_index_independent(self, xriemann_tensor, strategy)
+    monkeypatch.setattr(RiemannTensor, 'lower_index_independent', counted_lower_index_independent)
+    spacetime = Spacetime(metric_tensor, coord_sys)
+    weyl = spacetime.get_grtensor('Weyl Tensor')
+    kretschmann = spacetime.get_grtensor('Kretschmann Scalar')
+    assert weyl.index_variants is kretschmann.index_variants
+    assert weyl.riemann_pattern is not kretschmann.riemann_pattern
+    assert lowerings == ['cheap']   # R_abcd is lowered once for both objects
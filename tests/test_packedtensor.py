@@ -0,0 +1,22 @@
+# Checking that the components of the riemann tensor that are filled by an antisymmetry are given
+# in the same form as the simplified ones
+
+from objects.grtensors import Spacetime
+from objects.packedtensor import negative_component
+from sympy import latex, sin, symbols
+
+
+def test_negative_component():
+    r, r_s = symbols('r r_s')
+    assert latex(negative_component(r_s*(-r + r_s)/r**4)) == r'\frac{r_{s} \left(r - r_{s}\right)}{r^{4}}'
+    assert latex(negative_component(-r_s/(2*r - 2*r_s))) == r'\frac{r_{s}}{2 \left(r - r_{s}\right)}'
+    assert negative_component(r_s/r**3) == -r_s/r**3
+
+
+def test_filled_riemann_components():
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    r_s = symbols('r_s')
+    metric_tensor = [[-(1 - r_s/r), 0, 0, 0], [0, 1/(1 - r_s/r), 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    riemann_tensor = Spacetime(metric_tensor, coord_sys).get_tensor('Riemann Tensor')
+    assert latex(riemann_tensor[1, 0, 1, 0]) == r'\frac{r_{s} \left(- r + r_{s}\right)}{r^{4}}'
+    assert latex(riemann_tensor[1, 1, 0, 0]) == r'\frac{r_{s} \left(r - r_{s}\right)}{r^{4}}'
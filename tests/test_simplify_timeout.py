@@ -0,0 +1,76 @@
+# Checking that the components that run out of the time budget of the simplification are
+# recorded with their grtensor object and index, and that they keep their values
+
+import threading
+import time
+
+import pytest
+from objects import diskcache, simplifyobjects
+from objects.grtensors import Spacetime
+from sympy import simplify, sin, symbols
+
+
+@pytest.fixture
+def tiny_timeout():
+    simplifyobjects.clear_timed_out_components()
+    simplifyobjects.set_simplify_timeout(0.01)
+    yield
+    simplifyobjects.set_simplify_timeout(None)
+    simplifyobjects.clear_timed_out_components()
+
+
+def test_timed_out_components(tiny_timeout):
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    M = symbols('M')
+    metric_tensor = [[-(1 - 2*M/r), 0, 0, 0], [0, 1/(1 - 2*M/r), 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    spacetime = Spacetime(metric_tensor, coord_sys)
+    riemann_tensor = spacetime.get_tensor('Riemann Tensor')
+    timed_out = simplifyobjects.get_timed_out_components()
+    assert timed_out
+    assert all(label == 'Riemann Tensor' and len(index) == 4 for label, index in timed_out)
+    for _, index in timed_out:   # given in the 'cheap' tier, with the same value
+        assert simplify(riemann_tensor[index] - spacetime.get_grtensor('Riemann Tensor').riemann_obj[index]) == 0
+    simplifyobjects.clear_timed_out_components()
+    assert simplifyobjects.get_timed_out_components() == []
+
+
+def test_timed_out_tensors_are_not_stored(tiny_timeout, tmp_path):
+    t, r, theta, phi = coord_sys = list(symbols('t r theta phi'))
+    M = symbols('M')
+    metric_tensor = [[-(1 - 2*M/r), 0, 0, 0], [0, 1/(1 - 2*M/r), 0, 0], [0, 0, r**2, 0], [0, 0, 0, r**2*sin(theta)**2]]
+    diskcache.set_disk_cache(str(tmp_path))
+    try:
+        spacetime = Spacetime(metric_tensor, coord_sys)
+        spacetime.get_tensor('Riemann Tensor', 'dddd')
+        assert simplifyobjects.get_timed_out_components('Riemann Tensor')
+        assert not list(tmp_path.glob('*.srepr.z'))
+        simplifyobjects.set_simplify_timeout(None)
+        spacetime.get_tensor('Christoffel Symbol')
+        assert simplifyobjects.get_timed_out_components('Christoffel Symbol') == []
+        assert len(list(tmp_path.glob('*.srepr.z'))) == 1
+    finally:
+        diskcache.set_disk_cache(None)
+
+
+def test_killed_worker_is_taken_as_timeout(monkeypatch):
+    def stalled_simplify(expr):
+        time.sleep(60)
+        return expr
+
+    x = symbols('x')
+    component = (x**2 - 1)/(x - 1)
+    monkeypatch.setitem(simplifyobjects.simplification_tiers, 'trig', stalled_simplify)
+    monkeypatch.setattr(simplifyobjects, 'timeout_worker', None)   # the worker is started with the stalled tier
+    process, _ = simplifyobjects.get_timeout_worker()
+    killer = threading.Timer(0.5, process.kill)
+    killer.start()
+    try:
+        start = time.perf_counter()
+        simplified, timed_out = simplifyobjects.simplify_component(component, 'trig', 30)
+        elapsed = time.perf_counter() - start
+    finally:
+        killer.cancel()
+        simplifyobjects.timeout_worker = None
+    assert timed_out
+    assert elapsed < 10
+    assert simplify(simplified - (x + 1)) == 0
@@ -0,0 +1,15 @@
+# Checking that the zero test finds a component to be zero only if it is confirmed symbolically
+
+from objects.zerotest import is_zero, zero_test
+from sympy import Function, cos, sin, symbols
+
+
+def test_zero_test():
+    r, theta = symbols('r theta')
+    f = Function('f')(r)
+    assert zero_test((r**2 - 1)/(r - 1) - r - 1) is True
+    assert zero_test(f.diff(r)*r/f - r*f.diff(r)/f) is True
+    assert zero_test(r**2/(r + 1)) is False
+    assert zero_test(sin(theta)) is False
+    assert zero_test(sin(theta)**2 + cos(theta)**2 - 1) is None   # zero at all the points, but not confirmed
+    assert is_zero(sin(theta)**2 + cos(theta)**2 - 1)